@@ -4,14 +4,22 @@ ADA Compliance Analyzer - Core detection and analysis engine
 
 import cv2
 import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import torch
 from ultralytics import YOLO
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+import functools
+import hashlib
 import logging
+import pickle
+import re
+import sqlite3
+import threading
 
 from .compliance_engine import ComplianceRuleEngine
 from .cost_estimator import CostEstimator
+from .detections import Detections, LetterboxTransform
 from .measurement_extractor import MeasurementExtractor
 
 logging.basicConfig(level=logging.INFO)
@@ -24,11 +32,47 @@ class ComplianceAnalyzer:
     Integrates YOLOv8 detection, measurement extraction, and compliance evaluation
     """
     
+    # File suffix Ultralytics gives each export format
+    EXPORT_SUFFIXES = {
+        'engine': '.engine',
+        'onnx': '.onnx',
+        'torchscript': '.torchscript',
+        'openvino': '_openvino_model'
+    }
+    
+    # Input size used for exported models
+    EXPORT_IMGSZ = 640
+    
+    # Largest batch an exported model accepts (analyze_batch's default
+    # chunk size); exports use a dynamic batch axis up to this size
+    EXPORT_BATCH = 8
+    
+    # Color scheme for severity (BGR)
+    SEVERITY_COLORS = {
+        'High': (0, 0, 255),      # Red
+        'Medium': (0, 165, 255),  # Orange
+        'Low': (0, 255, 255)      # Yellow
+    }
+    
+    # Mapping of violation types to detection classes
+    TYPE_MAPPING = {
+        'curb_ramp': ('curb', 'ramp'),
+        'sidewalk': ('sidewalk', 'path'),
+        'crosswalk': ('crosswalk', 'crossing'),
+        'surface': ('sidewalk', 'path', 'ramp')
+    }
+    
     def __init__(
         self,
         model_path: str = "models/yolov8x-ada.pt",
         confidence_threshold: float = 0.6,
-        device: str = "auto"
+        device: str = "auto",
+        export_format: Optional[str] = None,
+        half: bool = True,
+        int8: bool = False,
+        calib_data: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        num_threads: Optional[int] = None
     ):
         """
         Initialize the analyzer
@@ -37,18 +81,98 @@ class ComplianceAnalyzer:
             model_path: Path to trained YOLOv8 model
             confidence_threshold: Minimum confidence for detections
             device: Device to run inference ('cpu', 'cuda', 'auto')
+            export_format: Optional accelerated format to run ('engine',
+                'onnx', 'torchscript', 'openvino'). The export is cached
+                next to the weights and reused on later runs.
+            half: Export with FP16 weights (GPU only)
+            int8: Quantize to INT8 on export ('engine' for TensorRT/Jetson,
+                'openvino' for Intel CPUs; defaults to 'engine' on GPU and
+                'openvino' on CPU when no export_format is given).
+                Quantized models may need a slightly lower
+                confidence_threshold to keep the same recall.
+            calib_data: Dataset YAML with representative images used for
+                INT8 calibration
+            cache_path: Optional SQLite file used to cache detections and
+                measurements by image hash, so re-analyzing the same image
+                skips inference
+            num_threads: Intra-op CPU threads for torch and OpenCV; set to
+                cores / worker processes when several run on one host
         """
         self.confidence_threshold = confidence_threshold
         self.device = self._get_device(device)
+        self.int8 = int8
+        self.calib_data = calib_data
+        if int8 and export_format is None:
+            export_format = 'openvino' if self.device == "cpu" else 'engine'
+        self.export_format = export_format
+        self.half = half and not int8 and self.device != "cpu"
+        
+        if self.device.startswith("cuda"):
+            # Input shape is fixed, so let cuDNN pick the fastest conv kernels
+            torch.backends.cudnn.benchmark = True
+        
+        if num_threads is not None:
+            self._set_num_threads(num_threads)
+        
+        # Lookup tables for _is_related, filled as new types/classes appear
+        self._type_keys: Dict[str, Optional[str]] = {}
+        self._class_to_viol: Dict[str, frozenset] = {}
+        
+        # Inverted TYPE_MAPPING (detection keyword -> violation keys) and
+        # single-pass regex matchers; the lookahead reports overlapping hits
+        self._keyword_to_viol: Dict[str, List[str]] = {}
+        for viol_key, detect_keywords in self.TYPE_MAPPING.items():
+            for keyword in detect_keywords:
+                self._keyword_to_viol.setdefault(keyword, []).append(viol_key)
+        self._keyword_pattern = re.compile(
+            '(?=(' + '|'.join(map(re.escape, self._keyword_to_viol)) + '))'
+        )
+        self._violation_key_pattern = re.compile(
+            '(?=(' + '|'.join(map(re.escape, self.TYPE_MAPPING)) + '))'
+        )
+        
+        # Pinned host staging buffer for GPU uploads (allocated on first use)
+        self._pinned_input = None
+        
+        # Serializes inference: the Ultralytics predictor keeps per-call
+        # state (args such as conf, batch, results) on the shared model, and
+        # the GPU path also shares the pinned buffer
+        self._model_lock = threading.Lock()
         
         # Initialize components
+        self.model_path = model_path
         self.model = self._load_model(model_path)
+        # Bound predictor with fixed settings, reused for every inference call
+        self._predict = functools.partial(
+            self.model.predict, device=self.device, verbose=False
+        )
+        self._warmup()
+        self._cache = self._open_cache(cache_path) if cache_path else None
+        self._cache_lock = threading.Lock()
         self.compliance_engine = ComplianceRuleEngine()
         self.cost_estimator = CostEstimator()
-        self.measurement_extractor = MeasurementExtractor()
+        self.measurement_extractor = MeasurementExtractor(device=self.device)
         
         logger.info(f"Analyzer initialized on device: {self.device}")
     
+    def _set_num_threads(self, num_threads: int):
+        """
+        Cap the CPU thread pools used for inference and image processing
+        
+        Avoids oversubscription when several server workers share a host.
+        
+        Args:
+            num_threads: Intra-op threads per process
+        """
+        torch.set_num_threads(num_threads)
+        try:
+            # Only allowed before any inter-op parallel work has started
+            torch.set_num_interop_threads(1)
+        except RuntimeError as e:
+            logger.warning(f"Could not set torch inter-op threads: {e}")
+        cv2.setNumThreads(num_threads)
+        logger.info(f"Using {num_threads} CPU threads")
+    
     def _get_device(self, device: str) -> str:
         """Determine which device to use"""
         if device == "auto":
@@ -56,26 +180,92 @@ class ComplianceAnalyzer:
         return device
     
     def _load_model(self, model_path: str) -> YOLO:
-        """Load YOLOv8 model"""
+        """Load YOLOv8 model, using a cached accelerated export if requested"""
         try:
             if Path(model_path).exists():
+                weights_path = Path(model_path)
                 model = YOLO(model_path)
                 logger.info(f"Loaded custom model from {model_path}")
             else:
                 # Use pretrained YOLOv8 as fallback
+                weights_path = Path('yolov8x.pt')
                 model = YOLO('yolov8x.pt')
                 logger.warning(f"Model not found at {model_path}, using pretrained YOLOv8x")
             
+            if self.export_format:
+                model = self._load_exported_model(model, weights_path)
+            else:
+                # Move weights to the device once and fuse Conv+BN layers
+                model.to(self.device)
+                model.fuse()
+            
             return model
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             raise
     
+    def _load_exported_model(self, model: YOLO, weights_path: Path) -> YOLO:
+        """
+        Load (or build once) an exported copy of the model
+        
+        Args:
+            model: Loaded PyTorch model
+            weights_path: Path of the .pt weights the export is derived from
+            
+        Returns:
+            Model backed by the exported artifact
+        """
+        if self.export_format not in self.EXPORT_SUFFIXES:
+            raise ValueError(
+                f"Unsupported export format: {self.export_format}. "
+                f"Choose from {list(self.EXPORT_SUFFIXES)}"
+            )
+        
+        # INT8 and batch-capable artifacts are cached under their own names
+        # so they never shadow (or reuse) a different export of the weights
+        variant = '-int8' if self.int8 else ''
+        exported_path = weights_path.parent / (
+            f"{weights_path.stem}{variant}-b{self.EXPORT_BATCH}"
+            f"{self.EXPORT_SUFFIXES[self.export_format]}"
+        )
+        
+        if exported_path.exists():
+            logger.info(f"Using cached {self.export_format} model: {exported_path}")
+        else:
+            logger.info(f"Exporting model to {self.export_format} (one-time)...")
+            export_kwargs = {
+                'format': self.export_format,
+                'half': self.half,
+                'int8': self.int8,
+                'imgsz': self.EXPORT_IMGSZ,
+                'batch': self.EXPORT_BATCH,
+                'dynamic': True,
+                'simplify': True,
+                'device': self.device
+            }
+            if self.int8 and self.calib_data:
+                export_kwargs['data'] = self.calib_data
+            
+            output_path = Path(model.export(**export_kwargs))
+            if output_path != exported_path:
+                output_path.rename(exported_path)
+            logger.info(f"Exported model saved to {exported_path}")
+        
+        return YOLO(str(exported_path), task='detect')
+    
+    def _warmup(self):
+        """Run one dummy inference so cuDNN autotuning / engine setup happens at load time"""
+        warmup = np.zeros((self.EXPORT_IMGSZ, self.EXPORT_IMGSZ, 3), dtype=np.uint8)
+        with torch.inference_mode():
+            self._predict(warmup)
+    
     def analyze(
         self,
         image: np.ndarray,
         confidence_threshold: Optional[float] = None,
-        location: Optional[str] = None
+        location: Optional[str] = None,
+        use_cache: bool = True,
+        annotate: bool = True
     ) -> Dict:
         """
         Analyze image for ADA compliance
@@ -84,35 +274,96 @@ class ComplianceAnalyzer:
             image: Input image as numpy array (BGR format)
             confidence_threshold: Override default confidence threshold
             location: Optional location string for the asset
+            use_cache: Consult the result cache (if configured); disable for
+                real-time streams where frames never repeat
+            annotate: Render the annotated image; when False
+                ``annotated_image`` is None
             
         Returns:
             Dictionary containing analysis results
         """
         conf_threshold = confidence_threshold or self.confidence_threshold
         
-        # Run object detection
-        detections = self._detect_objects(image, conf_threshold)
+        cache_key = None
+        cached = None
+        if use_cache and self._cache is not None:
+            cache_key = self._cache_key(image, conf_threshold)
+            cached = self._cache_get(cache_key)
+        
+        if cached is not None:
+            cached_detections, measurements = cached
+            detections = Detections.from_dicts(cached_detections)
+        else:
+            # Run object detection
+            detections = self._detect_objects(image, conf_threshold)
+            measurements = None
+        
+        results = self._analyze_detections(
+            image, detections, location, measurements=measurements, annotate=annotate
+        )
+        
+        if cache_key is not None and cached is None:
+            self._cache_put(cache_key, results['detections'], results['measurements'])
+        
+        return results
+    
+    def _analyze_detections(
+        self,
+        image: np.ndarray,
+        detections: Detections,
+        location: Optional[str] = None,
+        annotate_inplace: bool = False,
+        measurements: Optional[Dict] = None,
+        annotate: bool = True
+    ) -> Dict:
+        """
+        Run measurement, compliance, and cost stages on existing detections
+        
+        Args:
+            image: Input image as numpy array (BGR format)
+            detections: Detections produced for this image
+            location: Optional location string for the asset
+            annotate_inplace: Draw annotations directly on ``image``
+                (only when the caller no longer needs the original)
+            measurements: Previously extracted measurements (e.g. from the
+                cache); extracted from the image when omitted
+            annotate: Render the annotated image
+            
+        Returns:
+            Dictionary containing analysis results
+        """
+        # Measurement and rule components work on the public dict format
+        detection_dicts = detections.to_dicts()
         
         # Extract measurements from detected objects
-        measurements = self.measurement_extractor.extract(image, detections)
+        if measurements is None:
+            measurements = self.measurement_extractor.extract(image, detection_dicts)
         
         # Evaluate ADA compliance
-        violations = self.compliance_engine.evaluate(measurements, detections)
+        violations, total_weight = self.compliance_engine.evaluate_with_weight(
+            measurements, detection_dicts
+        )
         
         # Calculate compliance score
-        compliance_score = self._calculate_compliance_score(violations, detections)
+        compliance_score = self._calculate_compliance_score(
+            violations, detections, total_weight=total_weight
+        )
         
         # Estimate costs and timeline
         cost_analysis = self.cost_estimator.estimate(violations)
         
         # Generate annotated image
-        annotated_image = self._annotate_image(image, detections, violations)
+        annotated_image = None
+        if annotate:
+            annotated_image = self._annotate_image(
+                image, detections, violations, inplace=annotate_inplace
+            )
         
         # Compile results
         results = {
             'compliance_score': compliance_score,
             'violations': violations,
-            'detections': detections,
+            'detections': detection_dicts,
             'measurements': measurements,
             'total_cost': cost_analysis['total_cost'],
             'estimated_timeline': cost_analysis['timeline'],
@@ -131,7 +382,7 @@ class ComplianceAnalyzer:
         self,
         image: np.ndarray,
         confidence_threshold: float
-    ) -> List[Dict]:
+    ) -> Detections:
         """
         Run YOLOv8 object detection
         
@@ -140,103 +391,213 @@ class ComplianceAnalyzer:
             confidence_threshold: Minimum confidence for detections
             
         Returns:
-            List of detected objects with bounding boxes and classes
+            Detected objects with bounding boxes and classes
         """
-        # Run inference
-        results = self.model(image, conf=confidence_threshold, device=self.device)
-        
-        detections = []
-        for result in results:
-            boxes = result.boxes
-            for i, box in enumerate(boxes):
-                detection = {
-                    'class_id': int(box.cls[0]),
-                    'class_name': result.names[int(box.cls[0])],
-                    'confidence': float(box.conf[0]),
-                    'bbox': box.xyxy[0].cpu().numpy().tolist(),
-                    'center': self._calculate_center(box.xyxy[0].cpu().numpy())
-                }
-                detections.append(detection)
-        
-        return detections
+        return self._detect_batch([image], confidence_threshold)[0]
     
-    def _calculate_center(self, bbox: np.ndarray) -> Tuple[float, float]:
-        """Calculate center point of bounding box"""
-        x1, y1, x2, y2 = bbox
-        return ((x1 + x2) / 2, (y1 + y2) / 2)
+    def _detect_batch(
+        self,
+        images: List[np.ndarray],
+        confidence_threshold: float
+    ) -> List[Detections]:
+        """
+        Run YOLOv8 object detection on several images in one forward pass
+        
+        Args:
+            images: Input images (BGR)
+            confidence_threshold: Minimum confidence for detections
+            
+        Returns:
+            Detections for each image, in input order
+        """
+        if self.export_format and len(images) > self.EXPORT_BATCH:
+            # Exported models only accept up to EXPORT_BATCH frames per call
+            return [
+                detections
+                for start in range(0, len(images), self.EXPORT_BATCH)
+                for detections in self._detect_batch(
+                    images[start:start + self.EXPORT_BATCH], confidence_threshold
+                )
+            ]
+        
+        if not self.device.startswith("cuda"):
+            # Run inference
+            with self._model_lock, torch.inference_mode():
+                results = self._predict(images, conf=confidence_threshold)
+            
+            return [Detections.from_result(result) for result in results]
+        
+        # On GPU, letterbox + normalize each frame straight into pinned host
+        # memory (bypassing Ultralytics' Python preprocessor) so the upload
+        # is one async copy. The lock keeps concurrent callers from
+        # overwriting the buffer or the predictor's state.
+        with self._model_lock:
+            pinned = self._get_pinned_input(len(images))
+            transforms = [
+                self._letterbox_into(image, pinned[i].numpy())
+                for i, image in enumerate(images)
+            ]
+            gpu_input = pinned.to(self.device, non_blocking=True)
+            
+            with torch.inference_mode():
+                results = self._predict(gpu_input, conf=confidence_threshold)
+            
+            return [
+                Detections.from_result(result, transform)
+                for result, transform in zip(results, transforms)
+            ]
+    
+    def _get_pinned_input(self, batch: int) -> torch.Tensor:
+        """Return a pinned host buffer holding at least ``batch`` frames"""
+        if self._pinned_input is None or self._pinned_input.shape[0] < batch:
+            self._pinned_input = torch.empty(
+                (batch, 3, self.EXPORT_IMGSZ, self.EXPORT_IMGSZ),
+                dtype=torch.float16 if self.half else torch.float32,
+                pin_memory=True
+            )
+        return self._pinned_input[:batch]
+    
+    def _letterbox_into(
+        self,
+        image: np.ndarray,
+        out: np.ndarray
+    ) -> LetterboxTransform:
+        """
+        Letterbox a BGR image into a normalized CHW RGB buffer
+        
+        Args:
+            image: Input image (BGR, HWC, uint8)
+            out: Destination array of shape (3, size, size)
+            
+        Returns:
+            Tuple of (scale ratio, (pad_x, pad_y), original (height, width))
+            needed to map boxes back to image coordinates
+        """
+        size = out.shape[-1]
+        h, w = image.shape[:2]
+        ratio = min(size / h, size / w)
+        new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+        pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+        
+        resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        
+        # Ultralytics pads with gray (114) and feeds RGB scaled to 0-1. Only
+        # the border strips are filled; the image region is written once.
+        pad_value = 114 / 255
+        out[:, :pad_y] = pad_value
+        out[:, pad_y + new_h:] = pad_value
+        out[:, pad_y:pad_y + new_h, :pad_x] = pad_value
+        out[:, pad_y:pad_y + new_h, pad_x + new_w:] = pad_value
+        np.multiply(
+            resized[:, :, ::-1].transpose(2, 0, 1),
+            1 / 255,
+            out=out[:, pad_y:pad_y + new_h, pad_x:pad_x + new_w],
+            casting='unsafe'
+        )
+        
+        return ratio, (pad_x, pad_y), (h, w)
     
     def _calculate_compliance_score(
         self,
         violations: List[Dict],
-        detections: List[Dict]
+        detections: Union[Detections, List[Dict]],
+        total_weight: Optional[int] = None
     ) -> int:
         """
         Calculate overall compliance score (0-100)
         
-        Higher scores indicate better compliance
+        Higher scores indicate better compliance. ``total_weight`` is the
+        summed severity weight from the rule engine; it is recomputed from
+        ``violations`` when not supplied.
         """
         if not detections:
             return 100
         
-        # Weight violations by severity
-        severity_weights = {'High': 3, 'Medium': 2, 'Low': 1}
+        if total_weight is None:
+            # Weight violations by severity
+            severity_weights = self.compliance_engine.SEVERITY_WEIGHTS
+            total_weight = sum(severity_weights[v['severity']] for v in violations)
         
-        total_weight = sum(severity_weights[v['severity']] for v in violations)
         max_possible_weight = len(detections) * 3  # Assume all could be High
         
-        if max_possible_weight == 0:
-            return 100
-        
         # Calculate score (inverse of violation weight)
         score = 100 - int((total_weight / max_possible_weight) * 100)
         return max(0, min(100, score))
     
+    def annotate(self, image: np.ndarray, results: Dict) -> np.ndarray:
+        """
+        Draw the detections and violations of an earlier analysis on an image
+        
+        Lets callers that cache results without the annotated image render
+        it only when it is displayed.
+        
+        Args:
+            image: The analyzed image (BGR)
+            results: Results returned by ``analyze`` for that image
+            
+        Returns:
+            Annotated copy of the image
+        """
+        detections = Detections.from_dicts(results['detections'])
+        return self._annotate_image(image, detections, results['violations'])
+    
     def _annotate_image(
         self,
         image: np.ndarray,
-        detections: List[Dict],
-        violations: List[Dict]
+        detections: Detections,
+        violations: List[Dict],
+        inplace: bool = False
     ) -> np.ndarray:
         """
         Draw annotations on image showing detections and violations
         
         Args:
             image: Original image
-            detections: List of detected objects
+            detections: Detected objects
             violations: List of ADA violations
+            inplace: Draw directly on ``image`` instead of a copy
             
         Returns:
             Annotated image
         """
-        annotated = image.copy()
+        annotated = image if inplace else image.copy()
+        severity_colors = self.SEVERITY_COLORS
         
-        # Color scheme for severity
-        severity_colors = {
-            'High': (0, 0, 255),      # Red
-            'Medium': (0, 165, 255),  # Orange
-            'Low': (0, 255, 255)      # Yellow
-        }
+        # Relatedness only depends on the class name, so resolve the first
+        # related violation once per class instead of once per detection
+        class_styles = {}
         
         # Draw detections
-        for detection in detections:
-            x1, y1, x2, y2 = map(int, detection['bbox'])
-            
-            # Default green for compliant items
-            color = (0, 255, 0)
-            thickness = 2
-            
-            # Check if this detection has violations
-            for violation in violations:
-                if self._is_related(detection, violation):
-                    color = severity_colors[violation['severity']]
-                    thickness = 3
-                    break
-            
-            # Draw bounding box
-            cv2.rectangle(annotated, (x1, y1), (x2, y2), color, thickness)
-            
-            # Draw label
-            label = f"{detection['class_name']} {detection['confidence']:.2f}"
+        class_names = detections.class_names
+        bboxes = detections.bboxes.astype(np.int32)
+        # Rectangle corners as closed polygons, shape (N, 4, 2)
+        corners = bboxes[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+        
+        styles = []
+        style_indices = {}
+        for index, class_name in enumerate(class_names):
+            style = class_styles.get(class_name)
+            if style is None:
+                # Default green for compliant items
+                style = ((0, 255, 0), 2)
+                related_keys = self._related_keys(class_name)
+                for violation in violations:
+                    if self._violation_key(violation['type']) in related_keys:
+                        style = (severity_colors[violation['severity']], 3)
+                        break
+                class_styles[class_name] = style
+            styles.append(style)
+            style_indices.setdefault(style, []).append(index)
+        
+        # Draw bounding boxes, one polylines call per color/thickness
+        for (color, thickness), indices in style_indices.items():
+            cv2.polylines(annotated, corners[indices], True, color, thickness)
+        
+        # Draw labels
+        for class_name, score, (color, _), (x1, y1) in zip(
+            class_names, detections.confidences.tolist(), styles, bboxes[:, :2].tolist()
+        ):
+            label = f"{class_name} {score:.2f}"
             cv2.putText(
                 annotated,
                 label,
@@ -248,12 +609,13 @@ class ComplianceAnalyzer:
             )
         
         # Draw violation markers
-        for violation in violations:
-            if 'bbox' in violation:
-                x1, y1, x2, y2 = map(int, violation['bbox'])
-                center_x = (x1 + x2) // 2
-                center_y = (y1 + y2) // 2
-                
+        marked = [v for v in violations if 'bbox' in v]
+        if marked:
+            marker_boxes = np.asarray([v['bbox'] for v in marked], dtype=np.float64)
+            marker_boxes = marker_boxes.astype(np.int32)
+            centers = ((marker_boxes[:, :2] + marker_boxes[:, 2:]) // 2).tolist()
+            
+            for violation, (center_x, center_y) in zip(marked, centers):
                 # Draw warning icon
                 color = severity_colors[violation['severity']]
                 cv2.circle(annotated, (center_x, center_y), 15, color, -1)
@@ -271,23 +633,100 @@ class ComplianceAnalyzer:
     
     def _is_related(self, detection: Dict, violation: Dict) -> bool:
         """Check if a detection is related to a violation"""
-        # Simple check based on class type
-        violation_type = violation['type'].lower()
-        detection_class = detection['class_name'].lower()
-        
-        # Mapping of violation types to detection classes
-        type_mapping = {
-            'curb_ramp': ['curb', 'ramp'],
-            'sidewalk': ['sidewalk', 'path'],
-            'crosswalk': ['crosswalk', 'crossing'],
-            'surface': ['sidewalk', 'path', 'ramp']
-        }
+        # Simple check based on class type, resolved through cached lookups
+        viol_key = self._violation_key(violation['type'])
+        return viol_key is not None and viol_key in self._related_keys(detection['class_name'])
+    
+    def _violation_key(self, violation_type: str) -> Optional[str]:
+        """Map a violation type to its TYPE_MAPPING key (cached per type)"""
+        try:
+            return self._type_keys[violation_type]
+        except KeyError:
+            found = set(self._violation_key_pattern.findall(violation_type.lower()))
+            # First key in mapping order wins, as with a sequential scan
+            viol_key = next(
+                (key for key in self.TYPE_MAPPING if key in found),
+                None
+            )
+            self._type_keys[violation_type] = viol_key
+            return viol_key
+    
+    def _related_keys(self, class_name: str) -> frozenset:
+        """Violation keys a detection class can relate to (cached per class)"""
+        try:
+            return self._class_to_viol[class_name]
+        except KeyError:
+            found = self._keyword_pattern.findall(class_name.lower())
+            keys = frozenset(
+                viol_key
+                for keyword in found
+                for viol_key in self._keyword_to_viol[keyword]
+            )
+            self._class_to_viol[class_name] = keys
+            return keys
+    
+    def _open_cache(self, cache_path: str) -> sqlite3.Connection:
+        """Open (and create if needed) the SQLite result cache"""
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_path, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache ("
+            "hash TEXT PRIMARY KEY, detections BLOB, measurements BLOB)"
+        )
+        conn.commit()
+        logger.info(f"Result cache enabled: {cache_path}")
+        return conn
+    
+    def _cache_key(self, image: np.ndarray, confidence_threshold: float) -> str:
+        """Hash image content together with the settings that affect detections"""
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+        digest.update(str(image.shape).encode())
+        return f"{digest.hexdigest()}:{self.model_path}:{confidence_threshold}"
+    
+    def _cache_get(self, key: str) -> Optional[Tuple[List[Dict], Dict]]:
+        """
+        Look up cached detections and measurements
         
-        for viol_key, detect_keywords in type_mapping.items():
-            if viol_key in violation_type:
-                return any(keyword in detection_class for keyword in detect_keywords)
+        Measurements are keyed by ``id(detection)``, which is only valid
+        within a process, so they are stored by detection index and re-keyed
+        to the freshly loaded detection objects.
+        """
+        with self._cache_lock:
+            row = self._cache.execute(
+                "SELECT detections, measurements FROM analysis_cache WHERE hash = ?",
+                (key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        detections = pickle.loads(row[0])
+        stored = pickle.loads(row[1])
+        det_ids = [id(d) for d in detections]
+        measurements = {
+            name: {det_ids[index]: value for index, value in values.items()}
+            for name, values in stored.items()
+        }
+        return detections, measurements
+    
+    def _cache_put(self, key: str, detections: List[Dict], measurements: Dict):
+        """Store detections and measurements for an analyzed image"""
+        index_of = {id(d): index for index, d in enumerate(detections)}
+        stored = {
+            name: {
+                index_of[det_id]: value
+                for det_id, value in values.items()
+                if det_id in index_of
+            }
+            for name, values in measurements.items()
+        }
         
-        return False
+        with self._cache_lock:
+            self._cache.execute(
+                "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?)",
+                (key, pickle.dumps(detections), pickle.dumps(stored))
+            )
+            self._cache.commit()
     
     def _get_timestamp(self) -> str:
         """Get current timestamp"""
@@ -297,38 +736,98 @@ class ComplianceAnalyzer:
     def analyze_batch(
         self,
         image_paths: List[str],
-        output_dir: Optional[str] = None
+        output_dir: Optional[str] = None,
+        batch_size: int = 8,
+        num_workers: int = 4,
+        annotate: bool = False
     ) -> List[Dict]:
         """
         Analyze multiple images in batch
         
+        Images are run through the detector ``batch_size`` at a time so each
+        chunk is a single batched forward pass. The next chunk is read from
+        disk on a background thread pool while the current one is analyzed.
+        
         Args:
             image_paths: List of paths to images
             output_dir: Optional directory to save results
+            batch_size: Number of images per inference call
+            num_workers: Number of threads used to read images
+            annotate: Render annotated images (off by default since saved
+                batch results never include them)
             
         Returns:
             List of analysis results for each image
         """
         results = []
-        
-        for img_path in image_paths:
-            try:
-                # Read image
-                image = cv2.imread(str(img_path))
-                if image is None:
-                    logger.warning(f"Could not read image: {img_path}")
-                    continue
+        batch_size = max(1, batch_size)
+        chunks = [
+            image_paths[start:start + batch_size]
+            for start in range(0, len(image_paths), batch_size)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=max(1, num_workers)) as pool:
+            def prefetch(chunk: List[str]) -> List[Future]:
+                return [pool.submit(cv2.imread, str(img_path)) for img_path in chunk]
+            
+            pending = prefetch(chunks[0]) if chunks else []
+            
+            for index, chunk in enumerate(chunks):
+                futures = pending
                 
-                # Analyze
-                result = self.analyze(image)
-                result['image_path'] = str(img_path)
-                results.append(result)
+                # Start reading the next chunk before running inference
+                if index + 1 < len(chunks):
+                    pending = prefetch(chunks[index + 1])
                 
-                logger.info(f"Processed: {img_path}")
+                paths = []
+                images = []
+                for img_path, future in zip(chunk, futures):
+                    image = future.result()
+                    if image is None:
+                        logger.warning(f"Could not read image: {img_path}")
+                        continue
+                    paths.append(img_path)
+                    images.append(image)
+                
+                if not images:
+                    continue
                 
-            except Exception as e:
-                logger.error(f"Error processing {img_path}: {e}")
-                continue
+                # One batched forward pass for the whole chunk
+                try:
+                    batch_detections = self._detect_batch(images, self.confidence_threshold)
+                except Exception as e:
+                    # Retry one image at a time so a single bad frame only
+                    # costs that frame, not the whole chunk
+                    logger.warning(
+                        f"Batched inference failed for chunk starting at {paths[0]}, "
+                        f"retrying images individually: {e}"
+                    )
+                    batch_detections = []
+                    for img_path, image in zip(paths, images):
+                        try:
+                            batch_detections.extend(
+                                self._detect_batch([image], self.confidence_threshold)
+                            )
+                        except Exception as e:
+                            logger.error(f"Error running inference on {img_path}: {e}")
+                            batch_detections.append(None)
+                
+                for img_path, image, detections in zip(paths, images, batch_detections):
+                    if detections is None:
+                        continue
+                    try:
+                        # Images are read here and not reused, so skip the copy
+                        result = self._analyze_detections(
+                            image, detections, annotate_inplace=True, annotate=annotate
+                        )
+                        result['image_path'] = str(img_path)
+                        results.append(result)
+                        
+                        logger.info(f"Processed: {img_path}")
+                        
+                    except Exception as e:
+                        logger.error(f"Error processing {img_path}: {e}")
+                        continue
         
         # Save results if output directory specified
         if output_dir:
@@ -337,24 +836,28 @@ class ComplianceAnalyzer:
         return results
     
     def _save_batch_results(self, results: List[Dict], output_dir: str):
-        """Save batch analysis results"""
-        import json
+        """Save batch analysis results as newline-delimited JSON (one result per line)"""
+        import orjson
         from datetime import datetime
         
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        results_file = output_path / f"batch_results_{timestamp}.json"
-        
-        # Remove non-serializable items
-        serializable_results = []
-        for result in results:
-            clean_result = {k: v for k, v in result.items() 
-                          if k != 'annotated_image'}
-            serializable_results.append(clean_result)
-        
-        with open(results_file, 'w') as f:
-            json.dump(serializable_results, f, indent=2)
+        results_file = output_path / f"batch_results_{timestamp}.ndjson"
+        
+        options = (
+            orjson.OPT_SERIALIZE_NUMPY |
+            orjson.OPT_NON_STR_KEYS |
+            orjson.OPT_APPEND_NEWLINE
+        )
+        
+        with open(results_file, 'wb') as f:
+            for result in results:
+                # Skip non-serializable items
+                f.write(orjson.dumps(
+                    {k: v for k, v in result.items() if k != 'annotated_image'},
+                    option=options
+                ))
         
         logger.info(f"Batch results saved to: {results_file}")
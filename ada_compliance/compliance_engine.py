@@ -3,12 +3,32 @@ ADA Compliance Rule Engine
 Evaluates detected infrastructure against ADA standards
 """
 
-from typing import Dict, List
+from operator import itemgetter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class MeasurementBatch(NamedTuple):
+    """
+    Columnar view of measurements, one row per detection
+    Numeric columns hold NaN where a value was not measured
+    """
+    categories: np.ndarray
+    slopes: np.ndarray
+    cross_slopes: np.ndarray
+    widths: np.ndarray
+    landing_widths: np.ndarray
+    landing_lengths: np.ndarray
+    max_gaps: np.ndarray
+    vertical_changes: np.ndarray
+    marking_quality: np.ndarray
+    has_warning: np.ndarray
+    has_curb_ramps: np.ndarray
+
+
 class ComplianceRuleEngine:
     """
     Rule-based engine for evaluating ADA compliance
@@ -24,6 +44,32 @@ class ComplianceRuleEngine:
     MAX_VERTICAL_CHANGE = 0.25  # inches without treatment
     MIN_LANDING_SIZE = 36       # inches x 36 inches
     
+    # Infrastructure category codes used in MeasurementBatch.categories
+    CATEGORY_OTHER = 0
+    CATEGORY_CURB_RAMP = 1
+    CATEGORY_SIDEWALK = 2
+    CATEGORY_CROSSWALK = 3
+    CATEGORY_SURFACE = 4
+    
+    # Severity weights used for compliance scoring
+    SEVERITY_WEIGHTS = {'High': 3, 'Medium': 2, 'Low': 1}
+    
+    # Default priority for violations that do not set one
+    SEVERITY_PRIORITY = {'High': 1, 'Medium': 2, 'Low': 3}
+    
+    # Cost estimates for different violation types
+    COST_ESTIMATES = {
+        'Curb Ramp Slope': 2500,
+        'Cross Slope': 3200,
+        'Sidewalk Width': 1800,
+        'Detectable Warning': 800,
+        'Surface Quality': 2200,
+        'Landing Size': 1500,
+        'Missing Curb Ramps': 3500,
+        'Crosswalk Markings': 400,
+        'Trip Hazard': 1200
+    }
+    
     def __init__(self):
         """Initialize compliance rules"""
         self.rules = self._load_rules()
@@ -84,270 +130,350 @@ class ComplianceRuleEngine:
         Returns:
             List of violations found
         """
-        violations = []
+        violations, _ = self.evaluate_with_weight(measurements, detections)
+        return violations
+    
+    def evaluate_with_weight(
+        self,
+        measurements: Dict,
+        detections: List[Dict]
+    ) -> Tuple[List[Dict], int]:
+        """
+        Evaluate measurements and total the severity weight in the same pass
         
-        # Evaluate each type of infrastructure
-        for detection in detections:
-            class_name = detection['class_name'].lower()
-            
-            if 'curb' in class_name or 'ramp' in class_name:
-                violations.extend(self._check_curb_ramp(detection, measurements))
+        Rule thresholds are applied to columnar measurement arrays in one
+        vectorized step; violation dictionaries are only built for the
+        detections that actually fail a rule.
+        
+        Args:
+            measurements: Dictionary of extracted measurements
+            detections: List of detected objects
             
-            elif 'sidewalk' in class_name or 'path' in class_name:
-                violations.extend(self._check_sidewalk(detection, measurements))
+        Returns:
+            Tuple of (violations found, summed severity weight)
+        """
+        violations = []
+        
+        if detections:
+            det_ids = [detection.get('id', id(detection)) for detection in detections]
+            batch = self.build_measurement_batch(measurements, detections, det_ids)
+            masks = self._compute_violation_masks(batch)
             
-            elif 'crosswalk' in class_name or 'crossing' in class_name:
-                violations.extend(self._check_crosswalk(detection, measurements))
+            # Rules in the order they are reported for a single detection
+            rules = [(masks[name], source, builder) for name, source, builder in self._rule_table()]
+            failing = np.flatnonzero(np.logical_or.reduce([mask for mask, _, _ in rules]))
             
-            elif 'surface' in class_name:
-                violations.extend(self._check_surface_quality(detection, measurements))
+            for index in failing.tolist():
+                detection = detections[index]
+                det_id = det_ids[index]
+                for mask, source, builder in rules:
+                    if mask[index]:
+                        value = measurements[source].get(det_id)
+                        violations.append(builder(detection, value))
         
         # Prioritize violations
-        violations = self._prioritize_violations(violations)
+        violations, total_weight = self._prioritize_violations(violations)
         
         logger.info(f"Found {len(violations)} ADA violations")
-        return violations
+        return violations, total_weight
     
-    def _check_curb_ramp(
-        self,
-        detection: Dict,
-        measurements: Dict
-    ) -> List[Dict]:
-        """Check curb ramp compliance"""
-        violations = []
-        det_id = detection.get('id', id(detection))
-        
-        # Check slope
-        if 'slope' in measurements:
-            slope = measurements['slope'].get(det_id)
-            if slope and slope > self.MAX_CURB_RAMP_SLOPE:
-                violations.append({
-                    'type': 'Curb Ramp Slope',
-                    'severity': 'High',
-                    'detected_value': f"{slope:.1f}% (1:{100/slope:.1f} ratio)",
-                    'standard_value': f"≤{self.MAX_CURB_RAMP_SLOPE}% (1:12 ratio)",
-                    'location': 'Detected curb ramp',
-                    'reference': self.rules['curb_ramp_slope']['reference'],
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Reconstruct ramp to meet 1:12 maximum slope',
-                    'priority': 1
-                })
-        
-        # Check cross slope
-        if 'cross_slope' in measurements:
-            cross_slope = measurements['cross_slope'].get(det_id)
-            if cross_slope and cross_slope > self.MAX_CROSS_SLOPE:
-                violations.append({
-                    'type': 'Cross Slope',
-                    'severity': 'High',
-                    'detected_value': f"{cross_slope:.1f}%",
-                    'standard_value': f"≤{self.MAX_CROSS_SLOPE}%",
-                    'location': 'Curb ramp cross slope',
-                    'reference': self.rules['cross_slope']['reference'],
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Adjust cross slope to maximum 2%',
-                    'priority': 1
-                })
+    def _categorize(self, class_name: str) -> int:
+        """Map a detection class name to an infrastructure category code"""
+        class_name = class_name.lower()
         
-        # Check detectable warnings
-        if 'detectable_warning' in measurements:
-            has_warning = measurements['detectable_warning'].get(det_id, False)
-            if not has_warning:
-                violations.append({
-                    'type': 'Detectable Warning',
-                    'severity': 'High',
-                    'detected_value': 'Missing',
-                    'standard_value': 'Required at all curb ramps',
-                    'location': 'Curb ramp',
-                    'reference': self.rules['detectable_warning']['reference'],
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Install truncated dome detectable warning surface',
-                    'priority': 1
-                })
-        
-        # Check landing size
-        if 'landing_size' in measurements:
-            landing = measurements['landing_size'].get(det_id)
-            if landing and (landing[0] < self.MIN_LANDING_SIZE or 
-                          landing[1] < self.MIN_LANDING_SIZE):
-                violations.append({
-                    'type': 'Landing Size',
-                    'severity': 'Medium',
-                    'detected_value': f"{landing[0]}\" x {landing[1]}\"",
-                    'standard_value': f"≥{self.MIN_LANDING_SIZE}\" x {self.MIN_LANDING_SIZE}\"",
-                    'location': 'Curb ramp landing',
-                    'reference': self.rules['landing_size']['reference'],
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Expand landing to minimum 36" x 36"',
-                    'priority': 2
-                })
-        
-        return violations
+        if 'curb' in class_name or 'ramp' in class_name:
+            return self.CATEGORY_CURB_RAMP
+        elif 'sidewalk' in class_name or 'path' in class_name:
+            return self.CATEGORY_SIDEWALK
+        elif 'crosswalk' in class_name or 'crossing' in class_name:
+            return self.CATEGORY_CROSSWALK
+        elif 'surface' in class_name:
+            return self.CATEGORY_SURFACE
+        return self.CATEGORY_OTHER
     
-    def _check_sidewalk(
+    def build_measurement_batch(
         self,
-        detection: Dict,
-        measurements: Dict
-    ) -> List[Dict]:
-        """Check sidewalk compliance"""
-        violations = []
-        det_id = detection.get('id', id(detection))
+        measurements: Dict,
+        detections: List[Dict],
+        det_ids: Optional[List[int]] = None
+    ) -> MeasurementBatch:
+        """
+        Lay out per-detection measurements as parallel NumPy columns
         
-        # Check width
-        if 'width' in measurements:
-            width = measurements['width'].get(det_id)
-            if width and width < self.MIN_SIDEWALK_WIDTH:
-                violations.append({
-                    'type': 'Sidewalk Width',
-                    'severity': 'Medium',
-                    'detected_value': f"{width:.0f} inches",
-                    'standard_value': f"Minimum {self.MIN_SIDEWALK_WIDTH} inches",
-                    'location': 'Sidewalk',
-                    'reference': self.rules['sidewalk_width']['reference'],
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Widen sidewalk to minimum 36 inches',
-                    'priority': 2
-                })
+        Args:
+            measurements: Dictionary of extracted measurements
+            detections: List of detected objects
+            det_ids: Measurement keys for each detection (derived from the
+                detections when omitted)
+            
+        Returns:
+            MeasurementBatch with one row per detection
+        """
+        if det_ids is None:
+            det_ids = [detection.get('id', id(detection)) for detection in detections]
         
-        # Check cross slope
-        if 'cross_slope' in measurements:
-            cross_slope = measurements['cross_slope'].get(det_id)
-            if cross_slope and cross_slope > self.MAX_CROSS_SLOPE:
-                violations.append({
-                    'type': 'Cross Slope',
-                    'severity': 'High',
-                    'detected_value': f"{cross_slope:.1f}%",
-                    'standard_value': f"Maximum {self.MAX_CROSS_SLOPE}%",
-                    'location': 'Sidewalk',
-                    'reference': self.rules['cross_slope']['reference'],
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Regrade sidewalk to reduce cross slope',
-                    'priority': 1
-                })
+        def numeric(name: str) -> np.ndarray:
+            values = measurements.get(name, {})
+            column = [values.get(det_id) for det_id in det_ids]
+            return np.array(
+                [np.nan if value is None else value for value in column],
+                dtype=np.float64
+            )
         
-        return violations
-    
-    def _check_crosswalk(
-        self,
-        detection: Dict,
-        measurements: Dict
-    ) -> List[Dict]:
-        """Check crosswalk compliance"""
-        violations = []
-        det_id = detection.get('id', id(detection))
-        
-        # Check for curb ramps at crosswalk
-        if 'has_curb_ramps' in measurements:
-            has_ramps = measurements['has_curb_ramps'].get(det_id, False)
-            if not has_ramps:
-                violations.append({
-                    'type': 'Missing Curb Ramps',
-                    'severity': 'High',
-                    'detected_value': 'No curb ramps detected',
-                    'standard_value': 'Curb ramps required at all crossings',
-                    'location': 'Crosswalk',
-                    'reference': 'ADAAG 406',
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Install compliant curb ramps',
-                    'priority': 1
-                })
+        def flag(name: str) -> np.ndarray:
+            # Absent measurement type means the rule does not apply
+            if name not in measurements:
+                return np.ones(len(det_ids), dtype=bool)
+            values = measurements[name]
+            return np.array(
+                [bool(values.get(det_id, False)) for det_id in det_ids],
+                dtype=bool
+            )
         
-        # Check marking visibility
-        if 'marking_quality' in measurements:
-            quality = measurements['marking_quality'].get(det_id)
-            if quality and quality < 0.6:  # Quality score 0-1
-                violations.append({
-                    'type': 'Crosswalk Markings',
-                    'severity': 'Medium',
-                    'detected_value': f"Quality: {quality*100:.0f}%",
-                    'standard_value': 'Clear and visible markings required',
-                    'location': 'Crosswalk',
-                    'reference': 'MUTCD Section 3B.18',
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Repaint crosswalk markings',
-                    'priority': 2
-                })
+        landings = measurements.get('landing_size', {})
+        landing = np.array(
+            [landings.get(det_id) or (np.nan, np.nan) for det_id in det_ids],
+            dtype=np.float64
+        ).reshape(-1, 2)
         
-        return violations
+        return MeasurementBatch(
+            categories=np.array(
+                [self._categorize(d['class_name']) for d in detections],
+                dtype=np.int8
+            ),
+            slopes=numeric('slope'),
+            cross_slopes=numeric('cross_slope'),
+            widths=numeric('width'),
+            landing_widths=landing[:, 0],
+            landing_lengths=landing[:, 1],
+            max_gaps=numeric('max_gap'),
+            vertical_changes=numeric('vertical_change'),
+            marking_quality=numeric('marking_quality'),
+            has_warning=flag('detectable_warning'),
+            has_curb_ramps=flag('has_curb_ramps')
+        )
     
-    def _check_surface_quality(
-        self,
-        detection: Dict,
-        measurements: Dict
-    ) -> List[Dict]:
-        """Check surface quality compliance"""
-        violations = []
-        det_id = detection.get('id', id(detection))
+    def _compute_violation_masks(self, batch: MeasurementBatch) -> Dict[str, np.ndarray]:
+        """
+        Apply every ADA rule to the whole batch at once
         
-        # Check for cracks and gaps
-        if 'max_gap' in measurements:
-            max_gap = measurements['max_gap'].get(det_id)
-            if max_gap and max_gap > self.MAX_SURFACE_GAP:
-                violations.append({
-                    'type': 'Surface Quality',
-                    'severity': 'Medium',
-                    'detected_value': f"Gaps up to {max_gap:.2f} inches",
-                    'standard_value': f"Maximum {self.MAX_SURFACE_GAP} inch",
-                    'location': 'Surface',
-                    'reference': self.rules['surface_gap']['reference'],
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Repair or replace damaged surface',
-                    'priority': 3
-                })
+        Unmeasured values are NaN and never compare true. Zero readings are
+        treated as "not measured" for width and marking quality, matching
+        the truthiness checks the rules have always used.
+        """
+        curb = batch.categories == self.CATEGORY_CURB_RAMP
+        sidewalk = batch.categories == self.CATEGORY_SIDEWALK
+        crosswalk = batch.categories == self.CATEGORY_CROSSWALK
+        surface = batch.categories == self.CATEGORY_SURFACE
         
-        # Check for trip hazards
-        if 'vertical_change' in measurements:
-            vertical = measurements['vertical_change'].get(det_id)
-            if vertical and vertical > self.MAX_VERTICAL_CHANGE:
-                violations.append({
-                    'type': 'Trip Hazard',
-                    'severity': 'High',
-                    'detected_value': f"{vertical:.2f} inch vertical change",
-                    'standard_value': f"Maximum {self.MAX_VERTICAL_CHANGE} inch",
-                    'location': 'Surface',
-                    'reference': 'ADAAG 303.2',
-                    'bbox': detection['bbox'],
-                    'recommendation': 'Bevel edges or install ramp',
-                    'priority': 1
-                })
+        with np.errstate(invalid='ignore'):
+            steep = batch.slopes > self.MAX_CURB_RAMP_SLOPE
+            cross = batch.cross_slopes > self.MAX_CROSS_SLOPE
+            narrow = (batch.widths < self.MIN_SIDEWALK_WIDTH) & (batch.widths != 0)
+            small_landing = (
+                (batch.landing_widths < self.MIN_LANDING_SIZE) |
+                (batch.landing_lengths < self.MIN_LANDING_SIZE)
+            )
+            faded = (batch.marking_quality < 0.6) & (batch.marking_quality != 0)
+            gaps = batch.max_gaps > self.MAX_SURFACE_GAP
+            trips = batch.vertical_changes > self.MAX_VERTICAL_CHANGE
         
-        return violations
+        return {
+            'curb_ramp_slope': curb & steep,
+            'curb_ramp_cross_slope': curb & cross,
+            'detectable_warning': curb & ~batch.has_warning,
+            'landing_size': curb & small_landing,
+            'sidewalk_width': sidewalk & narrow,
+            'sidewalk_cross_slope': sidewalk & cross,
+            'missing_curb_ramps': crosswalk & ~batch.has_curb_ramps,
+            'crosswalk_markings': crosswalk & faded,
+            'surface_gap': surface & gaps,
+            'trip_hazard': surface & trips
+        }
+    
+    def _rule_table(self) -> List[Tuple[str, str, Callable[[Dict, object], Dict]]]:
+        """(mask name, measurement key, violation builder) in report order"""
+        return [
+            ('curb_ramp_slope', 'slope', self._curb_ramp_slope_violation),
+            ('curb_ramp_cross_slope', 'cross_slope', self._curb_ramp_cross_slope_violation),
+            ('detectable_warning', 'detectable_warning', self._detectable_warning_violation),
+            ('landing_size', 'landing_size', self._landing_size_violation),
+            ('sidewalk_width', 'width', self._sidewalk_width_violation),
+            ('sidewalk_cross_slope', 'cross_slope', self._sidewalk_cross_slope_violation),
+            ('missing_curb_ramps', 'has_curb_ramps', self._missing_curb_ramps_violation),
+            ('crosswalk_markings', 'marking_quality', self._crosswalk_markings_violation),
+            ('surface_gap', 'max_gap', self._surface_gap_violation),
+            ('trip_hazard', 'vertical_change', self._trip_hazard_violation)
+        ]
+    
+    def _curb_ramp_slope_violation(self, detection: Dict, slope: float) -> Dict:
+        """Curb ramp running slope exceeds 1:12"""
+        return {
+            'type': 'Curb Ramp Slope',
+            'severity': 'High',
+            'detected_value': f"{slope:.1f}% (1:{100/slope:.1f} ratio)",
+            'standard_value': f"≤{self.MAX_CURB_RAMP_SLOPE}% (1:12 ratio)",
+            'location': 'Detected curb ramp',
+            'reference': self.rules['curb_ramp_slope']['reference'],
+            'bbox': detection['bbox'],
+            'recommendation': 'Reconstruct ramp to meet 1:12 maximum slope',
+            'priority': 1
+        }
+    
+    def _curb_ramp_cross_slope_violation(self, detection: Dict, cross_slope: float) -> Dict:
+        """Curb ramp cross slope exceeds 2%"""
+        return {
+            'type': 'Cross Slope',
+            'severity': 'High',
+            'detected_value': f"{cross_slope:.1f}%",
+            'standard_value': f"≤{self.MAX_CROSS_SLOPE}%",
+            'location': 'Curb ramp cross slope',
+            'reference': self.rules['cross_slope']['reference'],
+            'bbox': detection['bbox'],
+            'recommendation': 'Adjust cross slope to maximum 2%',
+            'priority': 1
+        }
+    
+    def _detectable_warning_violation(self, detection: Dict, has_warning: bool) -> Dict:
+        """Curb ramp is missing a detectable warning surface"""
+        return {
+            'type': 'Detectable Warning',
+            'severity': 'High',
+            'detected_value': 'Missing',
+            'standard_value': 'Required at all curb ramps',
+            'location': 'Curb ramp',
+            'reference': self.rules['detectable_warning']['reference'],
+            'bbox': detection['bbox'],
+            'recommendation': 'Install truncated dome detectable warning surface',
+            'priority': 1
+        }
+    
+    def _landing_size_violation(self, detection: Dict, landing: Tuple[float, float]) -> Dict:
+        """Curb ramp landing smaller than 36 x 36 inches"""
+        return {
+            'type': 'Landing Size',
+            'severity': 'Medium',
+            'detected_value': f"{landing[0]}\" x {landing[1]}\"",
+            'standard_value': f"≥{self.MIN_LANDING_SIZE}\" x {self.MIN_LANDING_SIZE}\"",
+            'location': 'Curb ramp landing',
+            'reference': self.rules['landing_size']['reference'],
+            'bbox': detection['bbox'],
+            'recommendation': 'Expand landing to minimum 36" x 36"',
+            'priority': 2
+        }
+    
+    def _sidewalk_width_violation(self, detection: Dict, width: float) -> Dict:
+        """Sidewalk narrower than the minimum clear width"""
+        return {
+            'type': 'Sidewalk Width',
+            'severity': 'Medium',
+            'detected_value': f"{width:.0f} inches",
+            'standard_value': f"Minimum {self.MIN_SIDEWALK_WIDTH} inches",
+            'location': 'Sidewalk',
+            'reference': self.rules['sidewalk_width']['reference'],
+            'bbox': detection['bbox'],
+            'recommendation': 'Widen sidewalk to minimum 36 inches',
+            'priority': 2
+        }
+    
+    def _sidewalk_cross_slope_violation(self, detection: Dict, cross_slope: float) -> Dict:
+        """Sidewalk cross slope exceeds 2%"""
+        return {
+            'type': 'Cross Slope',
+            'severity': 'High',
+            'detected_value': f"{cross_slope:.1f}%",
+            'standard_value': f"Maximum {self.MAX_CROSS_SLOPE}%",
+            'location': 'Sidewalk',
+            'reference': self.rules['cross_slope']['reference'],
+            'bbox': detection['bbox'],
+            'recommendation': 'Regrade sidewalk to reduce cross slope',
+            'priority': 1
+        }
+    
+    def _missing_curb_ramps_violation(self, detection: Dict, has_ramps: bool) -> Dict:
+        """Crosswalk without curb ramps"""
+        return {
+            'type': 'Missing Curb Ramps',
+            'severity': 'High',
+            'detected_value': 'No curb ramps detected',
+            'standard_value': 'Curb ramps required at all crossings',
+            'location': 'Crosswalk',
+            'reference': 'ADAAG 406',
+            'bbox': detection['bbox'],
+            'recommendation': 'Install compliant curb ramps',
+            'priority': 1
+        }
     
-    def _prioritize_violations(self, violations: List[Dict]) -> List[Dict]:
+    def _crosswalk_markings_violation(self, detection: Dict, quality: float) -> Dict:
+        """Crosswalk markings below the visibility threshold"""
+        return {
+            'type': 'Crosswalk Markings',
+            'severity': 'Medium',
+            'detected_value': f"Quality: {quality*100:.0f}%",
+            'standard_value': 'Clear and visible markings required',
+            'location': 'Crosswalk',
+            'reference': 'MUTCD Section 3B.18',
+            'bbox': detection['bbox'],
+            'recommendation': 'Repaint crosswalk markings',
+            'priority': 2
+        }
+    
+    def _surface_gap_violation(self, detection: Dict, max_gap: float) -> Dict:
+        """Surface openings wider than 0.5 inch"""
+        return {
+            'type': 'Surface Quality',
+            'severity': 'Medium',
+            'detected_value': f"Gaps up to {max_gap:.2f} inches",
+            'standard_value': f"Maximum {self.MAX_SURFACE_GAP} inch",
+            'location': 'Surface',
+            'reference': self.rules['surface_gap']['reference'],
+            'bbox': detection['bbox'],
+            'recommendation': 'Repair or replace damaged surface',
+            'priority': 3
+        }
+    
+    def _trip_hazard_violation(self, detection: Dict, vertical: float) -> Dict:
+        """Untreated vertical change above 1/4 inch"""
+        return {
+            'type': 'Trip Hazard',
+            'severity': 'High',
+            'detected_value': f"{vertical:.2f} inch vertical change",
+            'standard_value': f"Maximum {self.MAX_VERTICAL_CHANGE} inch",
+            'location': 'Surface',
+            'reference': 'ADAAG 303.2',
+            'bbox': detection['bbox'],
+            'recommendation': 'Bevel edges or install ramp',
+            'priority': 1
+        }
+    
+    def _prioritize_violations(self, violations: List[Dict]) -> Tuple[List[Dict], int]:
         """
         Assign priority scores and add cost estimates
         Priority 1 = Critical (safety hazard)
         Priority 2 = Important (accessibility barrier)
         Priority 3 = Moderate (minor compliance issue)
+        
+        Returns the sorted violations and their summed severity weight
         """
-        # Cost estimates for different violation types
-        cost_estimates = {
-            'Curb Ramp Slope': 2500,
-            'Cross Slope': 3200,
-            'Sidewalk Width': 1800,
-            'Detectable Warning': 800,
-            'Surface Quality': 2200,
-            'Landing Size': 1500,
-            'Missing Curb Ramps': 3500,
-            'Crosswalk Markings': 400,
-            'Trip Hazard': 1200
-        }
+        cost_estimates = self.COST_ESTIMATES
+        severity_priority = self.SEVERITY_PRIORITY
+        severity_weights = self.SEVERITY_WEIGHTS
         
+        total_weight = 0
         for violation in violations:
+            severity = violation['severity']
+            total_weight += severity_weights[severity]
+            
             # Add cost estimate
-            viol_type = violation['type']
-            violation['cost'] = cost_estimates.get(viol_type, 1000)
+            violation['cost'] = cost_estimates.get(violation['type'], 1000)
             
             # Ensure priority is set
             if 'priority' not in violation:
-                if violation['severity'] == 'High':
-                    violation['priority'] = 1
-                elif violation['severity'] == 'Medium':
-                    violation['priority'] = 2
-                else:
-                    violation['priority'] = 3
+                violation['priority'] = severity_priority.get(severity, 3)
         
-        # Sort by priority, then by cost
-        violations.sort(key=lambda x: (x['priority'], -x['cost']))
+        # Sort by priority, then by cost (descending). Two stable C-level
+        # itemgetter sorts give the same order as a (priority, -cost) key.
+        violations.sort(key=itemgetter('cost'), reverse=True)
+        violations.sort(key=itemgetter('priority'))
         
-        return violations
+        return violations, total_weight
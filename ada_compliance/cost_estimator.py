@@ -3,84 +3,83 @@ Cost Estimation Module
 Estimates remediation costs and timelines for ADA violations
 """
 
+from enum import IntEnum
+import bisect
 from typing import Dict, List
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+class TypeId(IntEnum):
+    """Index of each violation type in the cost arrays below"""
+    CURB_RAMP_SLOPE = 0
+    CROSS_SLOPE = 1
+    SIDEWALK_WIDTH = 2
+    DETECTABLE_WARNING = 3
+    SURFACE_QUALITY = 4
+    LANDING_SIZE = 5
+    MISSING_CURB_RAMPS = 6
+    CROSSWALK_MARKINGS = 7
+    TRIP_HAZARD = 8
+    UNKNOWN = 9  # Fallback for violation types without a cost entry
+
+
+TYPE_NAMES = (
+    'Curb Ramp Slope',
+    'Cross Slope',
+    'Sidewalk Width',
+    'Detectable Warning',
+    'Surface Quality',
+    'Landing Size',
+    'Missing Curb Ramps',
+    'Crosswalk Markings',
+    'Trip Hazard'
+)
+TYPE_INDEX = {name: TypeId(i) for i, name in enumerate(TYPE_NAMES)}
+
+# Base cost estimates (in USD), one slot per TypeId
+MIN_COST = np.array([2000, 2500, 1500, 600, 1800, 1200, 3000, 300, 800, 1000], dtype=np.int32)
+MAX_COST = np.array([3500, 4000, 2500, 1200, 3000, 2000, 4500, 600, 1800, 1000], dtype=np.int32)
+TYPICAL_COST = np.array([2500, 3200, 1800, 800, 2200, 1500, 3500, 400, 1200, 1000], dtype=np.int32)
+LABOR_HOURS = np.array([16, 20, 12, 4, 14, 10, 24, 2, 8, 8], dtype=np.int32)
+UNITS = (
+    'per ramp',
+    'per section',
+    'per linear foot',
+    'per installation',
+    'per section',
+    'per landing',
+    'per ramp',
+    'per crossing',
+    'per repair',
+    'per item'
+)
+
+
 class CostEstimator:
     """
     Estimate costs and timelines for ADA compliance remediation
     Based on typical infrastructure improvement costs
     """
     
-    # Base cost estimates (in USD)
-    BASE_COSTS = {
-        'Curb Ramp Slope': {
-            'min': 2000,
-            'max': 3500,
-            'typical': 2500,
-            'unit': 'per ramp',
-            'labor_hours': 16
-        },
-        'Cross Slope': {
-            'min': 2500,
-            'max': 4000,
-            'typical': 3200,
-            'unit': 'per section',
-            'labor_hours': 20
-        },
-        'Sidewalk Width': {
-            'min': 1500,
-            'max': 2500,
-            'typical': 1800,
-            'unit': 'per linear foot',
-            'labor_hours': 12
-        },
-        'Detectable Warning': {
-            'min': 600,
-            'max': 1200,
-            'typical': 800,
-            'unit': 'per installation',
-            'labor_hours': 4
-        },
-        'Surface Quality': {
-            'min': 1800,
-            'max': 3000,
-            'typical': 2200,
-            'unit': 'per section',
-            'labor_hours': 14
-        },
-        'Landing Size': {
-            'min': 1200,
-            'max': 2000,
-            'typical': 1500,
-            'unit': 'per landing',
-            'labor_hours': 10
-        },
-        'Missing Curb Ramps': {
-            'min': 3000,
-            'max': 4500,
-            'typical': 3500,
-            'unit': 'per ramp',
-            'labor_hours': 24
-        },
-        'Crosswalk Markings': {
-            'min': 300,
-            'max': 600,
-            'typical': 400,
-            'unit': 'per crossing',
-            'labor_hours': 2
-        },
-        'Trip Hazard': {
-            'min': 800,
-            'max': 1800,
-            'typical': 1200,
-            'unit': 'per repair',
-            'labor_hours': 8
-        }
-    }
+    # Severity levels for cost grouping
+    SEVERITY_LEVELS = ('High', 'Medium', 'Low')
+    SEVERITY_INDEX = {severity: i for i, severity in enumerate(SEVERITY_LEVELS)}
+    
+    # Per-violation columns read by generate_cost_summary
+    _SUMMARY_DTYPE = np.dtype([
+        ('cost', np.float64),
+        ('severity', np.int64),
+        ('type', np.int64)
+    ])
+    
+    # Timeline arithmetic in units of 1/175 work day (see _estimate_timeline);
+    # a 5-day work week is 875 units
+    _DAY_UNITS = 175
+    _WEEK_UNITS = 5 * _DAY_UNITS
+    _TIMELINE_BOUNDS = (_WEEK_UNITS, 4 * _WEEK_UNITS, 12 * _WEEK_UNITS)
     
     # Complexity multipliers
     COMPLEXITY_FACTORS = {
@@ -121,43 +120,35 @@ class CostEstimator:
         # Get complexity multiplier
         multiplier = self.COMPLEXITY_FACTORS.get(complexity, 1.0)
         
-        # Calculate costs for each violation
-        breakdown = []
-        total_cost = 0
-        total_labor_hours = 0
+        # Gather costs for all violations at once; unknown types map to the
+        # fallback slot
+        type_ids = self._type_ids(violations)
+        known = type_ids != TypeId.UNKNOWN
+        
+        # Typical cost with complexity adjustment (fallback is not adjusted)
+        costs = TYPICAL_COST[type_ids].astype(np.int64)
+        costs[known] = (costs[known] * multiplier).astype(np.int64)
+        labor = LABOR_HOURS[type_ids].astype(np.int64)
+        
+        total_cost = int(costs.sum())
+        total_labor_hours = int(labor.sum())
         
-        for violation in violations:
-            viol_type = violation['type']
+        # Write back to violation records and build the breakdown
+        breakdown = []
+        for violation, type_id, cost, hours in zip(
+            violations, type_ids.tolist(), costs.tolist(), labor.tolist()
+        ):
+            violation['cost'] = cost
+            violation['labor_hours'] = hours
             
-            if viol_type in self.BASE_COSTS:
-                cost_info = self.BASE_COSTS[viol_type]
-                
-                # Use typical cost with complexity adjustment
-                base_cost = cost_info['typical']
-                adjusted_cost = int(base_cost * multiplier)
-                
-                # Add to violation record
-                violation['cost'] = adjusted_cost
-                violation['labor_hours'] = cost_info['labor_hours']
-                
+            if type_id != TypeId.UNKNOWN:
                 breakdown.append({
-                    'type': viol_type,
-                    'cost': adjusted_cost,
-                    'unit': cost_info['unit'],
-                    'labor_hours': cost_info['labor_hours'],
+                    'type': violation['type'],
+                    'cost': cost,
+                    'unit': UNITS[type_id],
+                    'labor_hours': hours,
                     'priority': violation.get('priority', 2)
                 })
-                
-                total_cost += adjusted_cost
-                total_labor_hours += cost_info['labor_hours']
-            else:
-                # Default cost for unknown violation types
-                default_cost = 1000
-                violation['cost'] = default_cost
-                violation['labor_hours'] = 8
-                
-                total_cost += default_cost
-                total_labor_hours += 8
         
         # Estimate timeline
         timeline = self._estimate_timeline(total_labor_hours, len(violations))
@@ -176,6 +167,14 @@ class CostEstimator:
             'complexity_factor': multiplier
         }
     
+    def _type_ids(self, violations: List[Dict]) -> np.ndarray:
+        """TypeId of each violation as an int64 array"""
+        return np.fromiter(
+            (TYPE_INDEX.get(v['type'], TypeId.UNKNOWN) for v in violations),
+            dtype=np.int64,
+            count=len(violations)
+        )
+    
     def _estimate_timeline(
         self,
         total_labor_hours: int,
@@ -185,29 +184,23 @@ class CostEstimator:
         Estimate project timeline based on labor hours
         Assumes crew of 2-3 workers, 8-hour days
         """
-        # Crew size and hours per day
-        crew_size = 2.5  # Average crew size
-        hours_per_day = 7  # Effective working hours
+        # Crew of 2.5 workers at 7 effective hours per day, plus a 20% buffer
+        # for weather, permits, etc.:
+        #   work_days = hours / (2.5 * 7) * 1.2 = hours * 12 / 175
+        # Kept as an integer in units of 1/175 day to avoid float rounding
+        scaled = total_labor_hours * 12
         
-        # Calculate work days
-        work_days = total_labor_hours / (crew_size * hours_per_day)
+        # Format timeline string (bounds: 1, 4 and 12 work weeks)
+        branch = bisect.bisect_right(self._TIMELINE_BOUNDS, scaled)
+        if branch == 0:
+            return f"{scaled // self._DAY_UNITS} days"
+        elif branch == 1:
+            return f"{scaled // self._WEEK_UNITS} weeks"
         
-        # Add buffer for weather, permits, etc. (20%)
-        work_days *= 1.2
-        
-        # Convert to weeks
-        work_weeks = work_days / 5  # 5-day work week
-        
-        # Format timeline string
-        if work_weeks < 1:
-            return f"{int(work_days)} days"
-        elif work_weeks < 4:
-            return f"{int(work_weeks)} weeks"
-        elif work_weeks < 12:
-            months = int(work_weeks / 4)
+        months = scaled // (4 * self._WEEK_UNITS)
+        if branch == 2:
             return f"{months}-{months+1} months"
         else:
-            months = int(work_weeks / 4)
             return f"{months} months"
     
     def estimate_phased_approach(
@@ -225,47 +218,47 @@ class CostEstimator:
         Returns:
             Phased remediation plan
         """
-        # Sort violations by priority
-        sorted_violations = sorted(
-            violations,
-            key=lambda x: (x.get('priority', 3), -x.get('cost', 0))
+        costs = np.fromiter(
+            (v.get('cost', 0) for v in violations),
+            dtype=np.int64,
+            count=len(violations)
+        )
+        priorities = np.fromiter(
+            (v.get('priority', 3) for v in violations),
+            dtype=np.int64,
+            count=len(violations)
         )
         
-        phases = []
-        current_phase = {
-            'violations': [],
-            'cost': 0,
-            'phase_number': 1
-        }
-        
-        remaining_budget = budget_constraint
+        # Sort violations by priority, most expensive first within a priority
+        # (lexsort is stable, like the previous sorted() call)
+        order = np.lexsort((-costs, priorities))
+        sorted_violations = [violations[i] for i in order.tolist()]
+        costs = costs[order]
         
-        for violation in sorted_violations:
-            cost = violation.get('cost', 0)
+        # Each phase takes the longest run of the remaining violations whose
+        # cost fits the budget, found by bisecting the running total
+        cumulative = np.cumsum(costs)
+        phases = []
+        start = 0
+        spent = 0
+        while start < len(sorted_violations):
+            end = int(np.searchsorted(cumulative, spent + budget_constraint, side='right'))
             
-            if cost <= remaining_budget:
-                current_phase['violations'].append(violation)
-                current_phase['cost'] += cost
-                remaining_budget -= cost
-            else:
-                # Start new phase
-                if current_phase['violations']:
-                    phases.append(current_phase)
-                    current_phase = {
-                        'violations': [violation],
-                        'cost': cost,
-                        'phase_number': len(phases) + 1
-                    }
-                    remaining_budget = budget_constraint - cost
-        
-        # Add last phase
-        if current_phase['violations']:
-            phases.append(current_phase)
+            # A single violation over budget still gets its own phase
+            end = max(end, start + 1)
+            
+            phases.append({
+                'violations': sorted_violations[start:end],
+                'cost': int(cumulative[end - 1]) - spent,
+                'phase_number': len(phases) + 1
+            })
+            start = end
+            spent = int(cumulative[end - 1])
         
         return {
             'phases': phases,
             'total_phases': len(phases),
-            'fully_funded': remaining_budget >= 0
+            'fully_funded': all(p['cost'] <= budget_constraint for p in phases)
         }
     
     def generate_cost_summary(
@@ -283,19 +276,58 @@ class CostEstimator:
         """
         estimate = self.estimate(violations)
         
+        # Read cost, severity and type of every violation in a single pass
+        severity_index = self.SEVERITY_INDEX
+        type_index = TYPE_INDEX.get
+        columns = np.fromiter(
+            (
+                (
+                    v.get('cost', 0),
+                    severity_index[v.get('severity', 'Medium')],
+                    type_index(v['type'], TypeId.UNKNOWN)
+                )
+                for v in violations
+            ),
+            dtype=self._SUMMARY_DTYPE,
+            count=len(violations)
+        )
+        costs = columns['cost']
+        severity_ids = columns['severity']
+        type_ids = columns['type']
+        
         # Group by severity
-        by_severity = {'High': 0, 'Medium': 0, 'Low': 0}
-        for violation in violations:
-            severity = violation.get('severity', 'Medium')
-            cost = violation.get('cost', 0)
-            by_severity[severity] += cost
+        severity_totals = np.bincount(
+            severity_ids, weights=costs, minlength=len(self.SEVERITY_LEVELS)
+        )
+        by_severity = {
+            severity: int(total)
+            for severity, total in zip(self.SEVERITY_LEVELS, severity_totals.tolist())
+        }
+        
+        # Group by type; (first index, name, total) entries so keys come out
+        # in order of first appearance
+        type_totals = np.bincount(type_ids, weights=costs, minlength=len(TypeId))
+        present, first_index = np.unique(type_ids, return_index=True)
+        entries = [
+            (first, TYPE_NAMES[type_id], int(type_totals[type_id]))
+            for type_id, first in zip(present.tolist(), first_index.tolist())
+            if type_id != TypeId.UNKNOWN
+        ]
+        
+        # Violation types without a cost entry keep their own names
+        unknown_rows = np.flatnonzero(type_ids == TypeId.UNKNOWN)
+        if unknown_rows.size:
+            unknown = {}
+            for index in unknown_rows.tolist():
+                viol_type = violations[index]['type']
+                first, total = unknown.get(viol_type, (index, 0))
+                unknown[viol_type] = (first, total + int(costs[index]))
+            entries.extend(
+                (first, viol_type, total) for viol_type, (first, total) in unknown.items()
+            )
         
-        # Group by type
-        by_type = {}
-        for violation in violations:
-            viol_type = violation['type']
-            cost = violation.get('cost', 0)
-            by_type[viol_type] = by_type.get(viol_type, 0) + cost
+        entries.sort()
+        by_type = {name: total for _, name, total in entries}
         
         # Calculate ROI metrics
         # Estimated annual cost of non-compliance (fines, liability)
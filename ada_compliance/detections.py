@@ -0,0 +1,159 @@
+"""
+Detection Container Module
+Columnar (structure-of-arrays) storage for object detections
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Letterbox transform: (scale ratio, (pad_x, pad_y), original (height, width))
+LetterboxTransform = Tuple[float, Tuple[int, int], Tuple[int, int]]
+
+
+@dataclass
+class Detections:
+    """
+    Detections for one image stored as parallel NumPy arrays
+
+    Dictionaries are only materialized (once) by ``to_dicts`` for the public
+    result format and for components keyed by detection objects.
+    """
+
+    class_ids: np.ndarray      # (N,) int64
+    confidences: np.ndarray    # (N,) float64
+    bboxes: np.ndarray         # (N, 4) float64, xyxy
+    names: Dict[int, str]
+    _dicts: Optional[List[Dict]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def empty(cls, names: Optional[Dict[int, str]] = None) -> "Detections":
+        """Create an empty detection set"""
+        return cls(
+            class_ids=np.empty(0, dtype=np.int64),
+            confidences=np.empty(0, dtype=np.float64),
+            bboxes=np.empty((0, 4), dtype=np.float64),
+            names=names or {}
+        )
+
+    @classmethod
+    def from_result(
+        cls,
+        result,
+        transform: Optional[LetterboxTransform] = None
+    ) -> "Detections":
+        """
+        Build from an Ultralytics ``Results`` object
+
+        Args:
+            result: Ultralytics result for one image
+            transform: Letterbox transform to undo when the model was fed a
+                preprocessed tensor
+        """
+        boxes = result.boxes
+        if len(boxes) == 0:
+            return cls.empty(result.names)
+
+        # Single device-to-host transfer per tensor instead of per box
+        xyxy = boxes.xyxy.cpu().numpy().astype(np.float64)
+        conf = boxes.conf.cpu().numpy().astype(np.float64)
+        cls_ids = boxes.cls.cpu().numpy().astype(np.int64)
+
+        if transform is not None:
+            # Undo letterbox padding and scaling
+            ratio, (pad_x, pad_y), (h, w) = transform
+            xyxy[:, 0::2] = np.clip((xyxy[:, 0::2] - pad_x) / ratio, 0, w)
+            xyxy[:, 1::2] = np.clip((xyxy[:, 1::2] - pad_y) / ratio, 0, h)
+
+        return cls(class_ids=cls_ids, confidences=conf, bboxes=xyxy, names=result.names)
+
+    @classmethod
+    def from_dicts(cls, detections: List[Dict]) -> "Detections":
+        """
+        Build from detection dictionaries, reusing them as ``to_dicts()``
+        so measurements keyed by ``id(detection)`` stay valid
+        """
+        if not detections:
+            instance = cls.empty()
+        else:
+            instance = cls(
+                class_ids=np.array([d['class_id'] for d in detections], dtype=np.int64),
+                confidences=np.array([d['confidence'] for d in detections], dtype=np.float64),
+                bboxes=np.array([d['bbox'] for d in detections], dtype=np.float64).reshape(-1, 4),
+                names={d['class_id']: d['class_name'] for d in detections}
+            )
+        instance._dicts = detections
+        return instance
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["Detections"]) -> "Detections":
+        """Join detection sets (e.g. several results for one image)"""
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return cls.empty()
+
+        names = {}
+        for part in parts:
+            names.update(part.names)
+        return cls(
+            class_ids=np.concatenate([p.class_ids for p in parts]),
+            confidences=np.concatenate([p.confidences for p in parts]),
+            bboxes=np.concatenate([p.bboxes for p in parts]),
+            names=names
+        )
+
+    def __len__(self) -> int:
+        return len(self.class_ids)
+
+    @property
+    def class_names(self) -> List[str]:
+        """Class name of each detection"""
+        names = self.names
+        return [names[class_id] for class_id in self.class_ids.tolist()]
+
+    def centers(self) -> np.ndarray:
+        """Box centers as an (N, 2) array"""
+        return (self.bboxes[:, :2] + self.bboxes[:, 2:]) * 0.5
+
+    def areas(self) -> np.ndarray:
+        """Box areas in square pixels"""
+        return (
+            (self.bboxes[:, 2] - self.bboxes[:, 0]) *
+            (self.bboxes[:, 3] - self.bboxes[:, 1])
+        )
+
+    def filter(self, mask: np.ndarray) -> "Detections":
+        """Return the detections selected by a boolean mask or index array"""
+        return Detections(
+            class_ids=self.class_ids[mask],
+            confidences=self.confidences[mask],
+            bboxes=self.bboxes[mask],
+            names=self.names
+        )
+
+    def to_dicts(self) -> List[Dict]:
+        """
+        Materialize the public list-of-dicts format
+
+        The list is built once and cached, so repeated calls return the same
+        objects.
+        """
+        if self._dicts is None:
+            centers = self.centers()
+            names = self.names
+            self._dicts = [
+                {
+                    'class_id': class_id,
+                    'class_name': names[class_id],
+                    'confidence': score,
+                    'bbox': bbox,
+                    'center': (x, y)
+                }
+                for class_id, score, bbox, x, y in zip(
+                    self.class_ids.tolist(), self.confidences.tolist(),
+                    self.bboxes.tolist(), centers[:, 0].tolist(),
+                    centers[:, 1].tolist()
+                )
+            ]
+        return self._dicts
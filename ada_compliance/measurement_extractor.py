@@ -5,8 +5,13 @@ Extracts physical measurements from detected infrastructure using OpenCV
 
 import cv2
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+import scipy.fft
+import torch
+import torch.nn.functional as F
+from typing import Callable, Dict, List, Tuple, Optional
+import functools
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +22,56 @@ class MeasurementExtractor:
     Uses computer vision techniques to estimate dimensions and slopes
     """
     
-    def __init__(self, calibration_factor: float = 1.0):
+    # Truncated dome pitch in pixels, and the spectral peak (relative to the
+    # mean magnitude in that band) required to call a surface periodic. A
+    # grid's peak grows with the number of periods in view, so ROIs whose
+    # short side is below PERIODICITY_FULL_SIZE use a proportionally lower
+    # threshold.
+    DOME_PERIOD_RANGE = (6, 24)
+    PERIODICITY_THRESHOLD = 12.0
+    PERIODICITY_FULL_SIZE = 128
+    
+    # ROIs with a longer side are halved before slope line detection
+    SLOPE_MAX_SIDE = 256
+    
+    # Edge maps denser than this are texture, not ramp edges
+    SLOPE_MAX_EDGE_DENSITY = 0.6
+    
+    # Below this many detections per frame the GPU upload and launch cost
+    # more than per-ROI OpenCV gradients
+    GPU_MIN_DETECTIONS = 16
+    
+    def __init__(
+        self,
+        calibration_factor: float = 1.0,
+        demo_mode: bool = False,
+        device: str = "cpu"
+    ):
         """
         Initialize measurement extractor
         
         Args:
             calibration_factor: Pixels to real-world unit conversion
+            demo_mode: Replace/perturb measurements with realistic random
+                values for demonstrations
+            device: Torch device; on CUDA, gradients for busy frames are
+                computed in one batched convolution
         """
         self.calibration_factor = calibration_factor
+        self.demo_mode = demo_mode
+        self.device = device
+        
+        # Per-thread scratch buffers for OpenCV outputs, grown on demand
+        self._buffers = threading.local()
+        
+        # 3x3 Sobel x/y kernels (cross-correlation, as in OpenCV)
+        self._sobel_kernels = None
+        if device.startswith("cuda"):
+            sobel_x = torch.tensor(
+                [[-1.0, 0.0, 1.0], [-2.0, 0.0, 2.0], [-1.0, 0.0, 1.0]]
+            )
+            self._sobel_kernels = torch.stack([sobel_x, sobel_x.T])[:, None].to(device)
+        
         logger.info("Measurement extractor initialized")
     
     def extract(
@@ -54,25 +101,64 @@ class MeasurementExtractor:
             'marking_quality': {}
         }
         
-        for detection in detections:
+        if not detections:
+            return measurements
+        
+        all_bounds = np.array(
+            [self._roi_bounds(image, d['bbox']) for d in detections],
+            dtype=np.int64
+        )
+        
+        # Convert only the area covered by detections, once; each ROI below
+        # is a view into it, so the helpers share one grayscale pass instead
+        # of converting per call
+        ox1, oy1 = all_bounds[:, :2].min(axis=0).tolist()
+        ox2, oy2 = all_bounds[:, 2:].max(axis=0).tolist()
+        gray = cv2.cvtColor(
+            image[oy1:oy2, ox1:ox2],
+            cv2.COLOR_BGR2GRAY,
+            dst=self._scratch('gray', (oy2 - oy1, ox2 - ox1), np.uint8)
+        )
+        
+        # Overlapping candidates often share the same ROI; run the expensive
+        # OpenCV pipelines once per (method, ROI) within this call
+        memo = {}
+        
+        if (
+            self._sobel_kernels is not None and
+            len(detections) >= self.GPU_MIN_DETECTIONS
+        ):
+            # One convolution over the whole area replaces a gradient pass
+            # per ROI; each ROI slices its gradients out of the result
+            full_dx, full_dy = self._gradients_gpu(gray)
+            for x1, y1, x2, y2 in set(map(tuple, all_bounds.tolist())):
+                rows = slice(y1 - oy1, y2 - oy1)
+                cols = slice(x1 - ox1, x2 - ox1)
+                memo[(self._gradients.__name__, (x1, y1, x2, y2))] = (
+                    full_dx[rows, cols], full_dy[rows, cols]
+                )
+        
+        for detection, bounds in zip(detections, map(tuple, all_bounds.tolist())):
             det_id = id(detection)
             class_name = detection['class_name'].lower()
-            bbox = detection['bbox']
             
-            # Extract region of interest
-            roi = self._extract_roi(image, bbox)
+            # Region of interest (grayscale view, offset into the converted area)
+            x1, y1, x2, y2 = bounds
+            roi = gray[y1 - oy1:y2 - oy1, x1 - ox1:x2 - ox1]
             
             if 'curb' in class_name or 'ramp' in class_name:
                 # Measure ramp characteristics
-                slope = self._measure_slope(roi)
+                dx, dy = self._measure_cached(memo, self._gradients, bounds, roi)
+                
+                slope = self._measure_cached(memo, self._measure_slope, bounds, roi, dx, dy)
                 if slope is not None:
                     measurements['slope'][det_id] = slope
                 
-                cross_slope = self._measure_cross_slope(roi)
+                cross_slope = self._measure_cached(memo, self._measure_cross_slope, bounds, roi)
                 if cross_slope is not None:
                     measurements['cross_slope'][det_id] = cross_slope
                 
-                has_warning = self._detect_warning_surface(roi)
+                has_warning = self._measure_cached(memo, self._detect_warning_surface, bounds, roi)
                 measurements['detectable_warning'][det_id] = has_warning
                 
                 landing = self._measure_landing(roi)
@@ -85,13 +171,15 @@ class MeasurementExtractor:
                 if width is not None:
                     measurements['width'][det_id] = width
                 
-                cross_slope = self._measure_cross_slope(roi)
+                cross_slope = self._measure_cached(memo, self._measure_cross_slope, bounds, roi)
                 if cross_slope is not None:
                     measurements['cross_slope'][det_id] = cross_slope
             
             elif 'crosswalk' in class_name:
                 # Check crosswalk features
-                has_ramps = self._check_curb_ramps(roi)
+                dx, dy = self._measure_cached(memo, self._gradients, bounds, roi)
+                
+                has_ramps = self._check_curb_ramps(roi, dx, dy)
                 measurements['has_curb_ramps'][det_id] = has_ramps
                 
                 quality = self._assess_marking_quality(roi)
@@ -99,22 +187,94 @@ class MeasurementExtractor:
             
             elif 'surface' in class_name:
                 # Assess surface quality
-                max_gap = self._detect_surface_gaps(roi)
+                dx, dy = self._measure_cached(memo, self._gradients, bounds, roi)
+                
+                max_gap = self._measure_cached(memo, self._detect_surface_gaps, bounds, roi, dx, dy)
                 if max_gap is not None:
                     measurements['max_gap'][det_id] = max_gap
                 
-                vertical_change = self._detect_vertical_changes(roi)
+                vertical_change = self._measure_cached(memo, self._detect_vertical_changes, bounds, roi)
                 if vertical_change is not None:
                     measurements['vertical_change'][det_id] = vertical_change
         
         return measurements
     
-    def _extract_roi(
+    def _measure_cached(
+        self,
+        memo: Dict,
+        method: Callable[..., object],
+        bounds: Tuple[int, int, int, int],
+        roi: np.ndarray,
+        *args
+    ):
+        """Call a measurement method once per ROI bounds within a memo"""
+        key = (method.__name__, bounds)
+        if key not in memo:
+            memo[key] = method(roi, *args)
+        return memo[key]
+    
+    def _gradients(self, gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        3x3 Sobel x/y derivatives (int16) computed in one pass
+        
+        Replicated borders match Canny's own gradient, so the pair can be fed
+        straight to ``cv2.Canny(dx, dy, ...)`` with identical edges.
+        """
+        return cv2.spatialGradient(gray, ksize=3, borderType=cv2.BORDER_REPLICATE)
+    
+    @torch.inference_mode()
+    def _gradients_gpu(self, gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        3x3 Sobel x/y derivatives (int16) of a grayscale area on the GPU
+        
+        Borders are replicated like ``_gradients``; interior ROIs see their
+        true neighbours instead of a replicated edge.
+        """
+        area = torch.from_numpy(np.ascontiguousarray(gray)).to(self.device)
+        area = F.pad(area[None, None].float(), (1, 1, 1, 1), mode='replicate')
+        gradients = F.conv2d(area, self._sobel_kernels)[0]
+        gradients = gradients.to(torch.int16).cpu().numpy()
+        return gradients[0], gradients[1]
+    
+    def _scratch(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: type
+    ) -> np.ndarray:
+        """
+        Contiguous scratch array reused across calls on the same thread
+        
+        Only for outputs consumed before the next call with the same name;
+        memoized results must own their memory.
+        """
+        size = int(np.prod(shape))
+        buffer = getattr(self._buffers, name, None)
+        if buffer is None or buffer.size < size or buffer.dtype != dtype:
+            buffer = np.empty(size, dtype=dtype)
+            setattr(self._buffers, name, buffer)
+        return buffer[:size].reshape(shape)
+    
+    def _edges(
+        self,
+        gray: np.ndarray,
+        low: float,
+        high: float,
+        dx: Optional[np.ndarray] = None,
+        dy: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Canny edges, reusing precomputed gradients when available"""
+        edges = self._scratch('edges', gray.shape[:2], np.uint8)
+        if dx is None or dy is None:
+            return cv2.Canny(gray, low, high, edges=edges)
+        return cv2.Canny(dx, dy, low, high, edges=edges)
+    
+    def _roi_bounds(
         self,
         image: np.ndarray,
         bbox: List[float]
-    ) -> np.ndarray:
-        """Extract region of interest from image"""
+    ) -> Tuple[int, int, int, int]:
+        """Padded, clipped integer bounds of a bounding box"""
         x1, y1, x2, y2 = map(int, bbox)
         
         # Add padding
@@ -125,50 +285,61 @@ class MeasurementExtractor:
         x2 = min(w, x2 + padding)
         y2 = min(h, y2 + padding)
         
-        return image[y1:y2, x1:x2]
+        return x1, y1, x2, y2
     
-    def _measure_slope(self, roi: np.ndarray) -> Optional[float]:
+    def _measure_slope(
+        self,
+        gray: np.ndarray,
+        dx: Optional[np.ndarray] = None,
+        dy: Optional[np.ndarray] = None
+    ) -> Optional[float]:
         """
         Measure slope angle of a ramp
         Returns slope as percentage
         """
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            # Only the dominant orientation matters, which survives halving
+            # large ROIs; Hough voting then sees a quarter of the edge pixels
+            scale = 1
+            if max(gray.shape[:2]) > self.SLOPE_MAX_SIDE:
+                gray = cv2.resize(gray, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+                dx = dy = None
+                scale = 2
             
             # Edge detection
-            edges = cv2.Canny(gray, 50, 150)
+            edges = self._edges(gray, 50, 150, dx, dy)
+            
+            # Hough needs at least `threshold` edge pixels to vote a line, and
+            # near-solid edge maps (heavy texture) only yield spurious lines
+            vote_threshold = 50 // scale
+            edge_count = cv2.countNonZero(edges)
+            if (
+                edge_count < vote_threshold or
+                edge_count > self.SLOPE_MAX_EDGE_DENSITY * edges.size
+            ):
+                return None
             
-            # Detect lines using Hough transform
+            # Detect lines using Hough transform (lengths in original pixels)
             lines = cv2.HoughLinesP(
                 edges,
                 rho=1,
                 theta=np.pi/180,
-                threshold=50,
-                minLineLength=30,
-                maxLineGap=10
+                threshold=vote_threshold,
+                minLineLength=30 // scale,
+                maxLineGap=10 // scale
             )
             
             if lines is None or len(lines) == 0:
                 return None
             
-            # Find dominant angle
-            angles = []
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                angle = np.abs(np.arctan2(y2 - y1, x2 - x1) * 180 / np.pi)
-                if 0 < angle < 45:  # Reasonable slope range
-                    angles.append(angle)
-            
-            if not angles:
+            # Dominant slope percentage
+            slope_percent = self._reduce_slopes(lines)
+            if slope_percent is None:
                 return None
             
-            # Calculate average angle and convert to slope percentage
-            avg_angle = np.median(angles)
-            slope_percent = np.tan(avg_angle * np.pi / 180) * 100
-            
             # Add some realistic variance for demo
-            slope_percent += np.random.uniform(-1, 3)
+            if self.demo_mode:
+                slope_percent += np.random.uniform(-1, 3)
             
             return max(0, min(20, slope_percent))  # Clamp between 0-20%
             
@@ -176,26 +347,51 @@ class MeasurementExtractor:
             logger.warning(f"Error measuring slope: {e}")
             return None
     
-    def _measure_cross_slope(self, roi: np.ndarray) -> Optional[float]:
+    @staticmethod
+    def _reduce_slopes(lines: np.ndarray) -> Optional[float]:
+        """
+        Median slope (percent) of Hough line segments within the slope range
+        
+        Args:
+            lines: HoughLinesP output, (N, 1, 4) or (N, 4)
+            
+        Returns:
+            Median rise over run as a percentage, or None if no segment is
+            in range
+        """
+        segments = lines.reshape(-1, 4).astype(np.float64)
+        dx = segments[:, 2] - segments[:, 0]
+        dy = np.abs(segments[:, 3] - segments[:, 1])
+        
+        # Reasonable slope range: rightward segments between 0 and 45 degrees
+        in_range = (dx > 0) & (dy > 0) & (dy < dx)
+        if not in_range.any():
+            return None
+        return float(np.median(dy[in_range] / dx[in_range])) * 100
+    
+    def _measure_cross_slope(self, gray: np.ndarray) -> Optional[float]:
         """
         Measure cross slope (perpendicular to direction of travel)
         Returns slope as percentage
+        
+        Uses its own 5x5 Sobel pass: the shared 3x3 gradients only match a
+        scaled 5x5 response on linear ramps, not on texture or step edges.
         """
         try:
             # Simplified measurement - analyze horizontal gradient
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            
-            # Calculate gradient
-            sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=5)
-            
             # Estimate cross slope from gradient magnitude
+            sobelx = cv2.Sobel(
+                gray, cv2.CV_64F, 1, 0, ksize=5,
+                dst=self._scratch('sobel', gray.shape[:2], np.float64)
+            )
             gradient_mean = np.abs(sobelx).mean()
             
             # Convert to approximate slope percentage
             cross_slope = (gradient_mean / 255) * 5  # Normalize to typical range
             
             # Add realistic variance
-            cross_slope += np.random.uniform(-0.5, 0.8)
+            if self.demo_mode:
+                cross_slope += np.random.uniform(-0.5, 0.8)
             
             return max(0, min(5, cross_slope))  # Clamp between 0-5%
             
@@ -216,6 +412,9 @@ class MeasurementExtractor:
             estimated_width_px = width * 0.7  # Approximate actual width
             estimated_width_inches = estimated_width_px * self.calibration_factor
             
+            if not self.demo_mode:
+                return estimated_width_inches
+            
             # For demo, add realistic variance around typical sidewalk widths
             if estimated_width_inches < 30:
                 width_inches = np.random.uniform(28, 35)
@@ -228,31 +427,44 @@ class MeasurementExtractor:
             logger.warning(f"Error measuring width: {e}")
             return None
     
-    def _detect_warning_surface(self, roi: np.ndarray) -> bool:
+    def _detect_warning_surface(self, gray: np.ndarray) -> bool:
         """
         Detect presence of truncated dome warning surface
         """
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            
             # Look for repetitive pattern (dome texture)
-            # Use blob detection
-            params = cv2.SimpleBlobDetector_Params()
-            params.filterByArea = True
-            params.minArea = 10
-            params.maxArea = 100
-            params.filterByCircularity = True
-            params.minCircularity = 0.7
-            
-            detector = cv2.SimpleBlobDetector_create(params)
-            keypoints = detector.detect(gray)
-            
-            # If many circular blobs detected, likely detectable warning
-            has_warning = len(keypoints) > 20
+            # Domes sit on a regular grid, so the texture shows up as a
+            # strong peak in the spectrum at the dome pitch
+            # Only look for pitches that repeat at least three times in the ROI
+            h, w = gray.shape[:2]
+            short_side = min(h, w)
+            min_period = self.DOME_PERIOD_RANGE[0]
+            max_period = min(self.DOME_PERIOD_RANGE[1], short_side // 3)
+            if max_period < min_period:
+                return False
+            
+            window, band, across, along = self._spectral_masks(
+                h, w, min_period, max_period
+            )
+            if not (across.any() and along.any()):
+                return False
+            
+            # Remove the mean and taper the edges so brightness gradients do
+            # not leak into the dome band
+            signal = gray.astype(np.float32)
+            signal -= signal.mean()
+            signal *= window
+            spectrum = np.abs(scipy.fft.rfft2(signal, workers=-1))
+            threshold = self.PERIODICITY_THRESHOLD * min(1.0, short_side / self.PERIODICITY_FULL_SIZE)
+            noise_floor = spectrum[band].mean() * threshold
+            
+            has_warning = bool(
+                spectrum[across].max() > noise_floor and
+                spectrum[along].max() > noise_floor
+            )
             
             # For demo, add some randomness
-            if np.random.random() < 0.3:  # 30% chance of missing
+            if self.demo_mode and np.random.random() < 0.3:  # 30% chance of missing
                 has_warning = False
             
             return has_warning
@@ -261,38 +473,74 @@ class MeasurementExtractor:
             logger.warning(f"Error detecting warning surface: {e}")
             return False
     
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _spectral_masks(
+        h: int,
+        w: int,
+        min_period: int,
+        max_period: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Taper window and rfft2 masks for dome detection, cached per ROI shape
+        
+        Returns:
+            Hann window, dome pitch band, and the band split into bins
+            varying across / along the ROI
+        """
+        window = np.outer(np.hanning(h), np.hanning(w)).astype(np.float32)
+        
+        # Radial frequency (cycles per pixel) of each rfft2 bin
+        freq_y = np.abs(scipy.fft.fftfreq(h))[:, None]
+        freq_x = scipy.fft.rfftfreq(w)[None, :]
+        radial = np.sqrt(freq_y ** 2 + freq_x ** 2)
+        band = (radial >= 1.0 / max_period) & (radial <= 1.0 / min_period)
+        
+        # A dome grid repeats both across and along the ROI; striped
+        # markings only peak in one direction
+        across = band & (freq_x > freq_y)
+        along = band & (freq_y >= freq_x)
+        
+        for mask in (window, band, across, along):
+            mask.flags.writeable = False
+        return window, band, across, along
+    
     def _measure_landing(self, roi: np.ndarray) -> Optional[Tuple[float, float]]:
         """
         Measure landing dimensions (width, length) in inches
         """
         try:
+            if self.demo_mode:
+                # Add realistic variance (replaces the estimate entirely)
+                return (np.random.uniform(32, 48), np.random.uniform(32, 48))
+            
             height, width = roi.shape[:2]
             
             # Estimate landing size with calibration
             landing_width = width * self.calibration_factor * 0.6
             landing_length = height * self.calibration_factor * 0.6
             
-            # Add realistic variance
-            landing_width = np.random.uniform(32, 48)
-            landing_length = np.random.uniform(32, 48)
-            
             return (landing_width, landing_length)
             
         except Exception as e:
             logger.warning(f"Error measuring landing: {e}")
             return None
     
-    def _check_curb_ramps(self, roi: np.ndarray) -> bool:
+    def _check_curb_ramps(
+        self,
+        gray: np.ndarray,
+        dx: Optional[np.ndarray] = None,
+        dy: Optional[np.ndarray] = None
+    ) -> bool:
         """
         Check if curb ramps are present at crosswalk
         """
         try:
             # Simplified detection - look for edge patterns
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 50, 150)
+            edges = self._edges(gray, 50, 150, dx, dy)
             
             # Count edge pixels
-            edge_density = np.sum(edges > 0) / edges.size
+            edge_density = cv2.countNonZero(edges) / edges.size
             
             # Higher edge density suggests ramp presence
             has_ramps = edge_density > 0.15
@@ -303,14 +551,11 @@ class MeasurementExtractor:
             logger.warning(f"Error checking curb ramps: {e}")
             return False
     
-    def _assess_marking_quality(self, roi: np.ndarray) -> float:
+    def _assess_marking_quality(self, gray: np.ndarray) -> float:
         """
         Assess quality of crosswalk markings (0-1 scale)
         """
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            
             # Assess contrast and clarity
             contrast = gray.std() / 128.0  # Normalize
             
@@ -321,7 +566,8 @@ class MeasurementExtractor:
             quality = (contrast * 0.5 + white_pixels * 0.5)
             
             # Add variance
-            quality += np.random.uniform(-0.2, 0.1)
+            if self.demo_mode:
+                quality += np.random.uniform(-0.2, 0.1)
             
             return max(0.0, min(1.0, quality))
             
@@ -329,33 +575,36 @@ class MeasurementExtractor:
             logger.warning(f"Error assessing marking quality: {e}")
             return 0.5
     
-    def _detect_surface_gaps(self, roi: np.ndarray) -> Optional[float]:
+    def _detect_surface_gaps(
+        self,
+        gray: np.ndarray,
+        dx: Optional[np.ndarray] = None,
+        dy: Optional[np.ndarray] = None
+    ) -> Optional[float]:
         """
         Detect cracks and gaps in surface (returns max gap in inches)
         """
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            
             # Detect edges (cracks)
-            edges = cv2.Canny(gray, 30, 100)
+            edges = self._edges(gray, 30, 100, dx, dy)
             
-            # Find contours
-            contours, _ = cv2.findContours(
+            # Bounding boxes of all edge blobs in one pass (row 0 is the
+            # background); same boxes as the external contours
+            num_labels, _, stats, _ = cv2.connectedComponentsWithStats(
                 edges,
-                cv2.RETR_EXTERNAL,
-                cv2.CHAIN_APPROX_SIMPLE
+                labels=self._scratch('labels', edges.shape[:2], np.int32),
+                connectivity=8
             )
             
-            if not contours:
+            if num_labels <= 1:
                 return 0.0
             
             # Find largest gap (crack width)
-            max_width = 0
-            for contour in contours:
-                x, y, w, h = cv2.boundingRect(contour)
-                width = min(w, h) * self.calibration_factor
-                max_width = max(max_width, width)
+            blob_sizes = stats[1:, [cv2.CC_STAT_WIDTH, cv2.CC_STAT_HEIGHT]]
+            max_width = float(blob_sizes.min(axis=1).max()) * self.calibration_factor
+            
+            if not self.demo_mode:
+                return max_width
             
             # For demo, add realistic crack sizes
             if max_width > 0.1:
@@ -369,23 +618,29 @@ class MeasurementExtractor:
             logger.warning(f"Error detecting surface gaps: {e}")
             return None
     
-    def _detect_vertical_changes(self, roi: np.ndarray) -> Optional[float]:
+    def _detect_vertical_changes(self, gray: np.ndarray) -> Optional[float]:
         """
         Detect vertical changes/lips in surface (returns height in inches)
+        
+        Uses its own 5x5 Sobel pass, like ``_measure_cross_slope``; a lip is
+        a step edge, where rescaled 3x3 gradients overestimate the peak.
         """
         try:
             # Simplified detection using edge analysis
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            
-            # Look for strong horizontal edges (vertical changes)
-            sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=5)
-            
-            # Find maximum vertical gradient
+            # Look for strong horizontal edges (vertical changes) and find
+            # the maximum vertical gradient
+            sobely = cv2.Sobel(
+                gray, cv2.CV_64F, 0, 1, ksize=5,
+                dst=self._scratch('sobel', gray.shape[:2], np.float64)
+            )
             max_gradient = np.max(np.abs(sobely))
             
             # Convert to approximate height
             vertical_change = (max_gradient / 255) * 2 * self.calibration_factor
             
+            if not self.demo_mode:
+                return vertical_change
+            
             # For demo, simulate realistic values
             if vertical_change > 0.1:
                 vertical_change = np.random.uniform(0.2, 0.4)
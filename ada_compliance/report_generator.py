@@ -10,17 +10,161 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib import colors
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Tuple
+import copy
+import functools
+import heapq
+import itertools
 import logging
+import numpy as np
+
+from .violations import SEVERITY_CODES, Violation, ViolationTable
 
 logger = logging.getLogger(__name__)
 
+# Dollar amount with thousands separators, bound once for the row loops
+_fmt_money = "${:,}".format
+
+
+# Table styles shared by every report (TableStyle is only read by Table)
+_TITLE_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#4b5563')),
+    ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#111827')),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+_VIOLATION_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+_BREAKDOWN_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#dbeafe')),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+])
+
+
+# Fixed text of every report: (markup, style name), parsed once per generator
+_STATIC_PARAGRAPHS = {
+    'title': ("ADA Compliance Assessment Report", 'CustomTitle'),
+    'subtitle': ("Pedestrian Infrastructure Evaluation", 'Heading2'),
+    'disclaimer': (
+        "<i>This report was generated using AI-powered computer vision analysis. "
+        "All measurements and assessments should be verified by qualified professionals "
+        "before making final compliance decisions.</i>",
+        'Normal'
+    ),
+    'summary_header': ("Executive Summary", 'SectionHeader'),
+    'violations_header': ("Detailed Violations", 'SectionHeader'),
+    'no_violations': (
+        "No ADA violations detected. Infrastructure meets compliance standards.",
+        'Normal'
+    ),
+    'cost_header': ("Cost Analysis & Budget", 'SectionHeader'),
+    'recommendations_header': ("Recommendations & Next Steps", 'SectionHeader'),
+    'recommendations': (
+        # One paragraph for the whole list instead of a flowable per item
+        "<br/><br/>".join([
+            "1. <b>Immediate Actions</b> - Address all High priority violations within 30-60 days",
+            "2. <b>Phased Approach</b> - Develop multi-year capital improvement plan for Medium/Low priority items",
+            "3. <b>Grant Funding</b> - Apply for federal/state accessibility grants using this report",
+            "4. <b>Professional Verification</b> - Have licensed engineers verify measurements and costs",
+            "5. <b>Community Engagement</b> - Solicit input from disability advocacy groups",
+            "6. <b>Ongoing Monitoring</b> - Conduct annual accessibility audits",
+            "7. <b>Documentation</b> - Maintain records of all remediation efforts for compliance"
+        ]),
+        'Normal'
+    ),
+    'contact': (
+        "<b>For Questions or Support:</b><br/>"
+        "ADA Compliance Assessment System<br/>"
+        "Email: support@ada-compliance.com<br/>"
+        "Phone: (555) 123-4567",
+        'Normal'
+    ),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _build_styles():
+    """
+    Build the report stylesheet once per process
+    
+    The sample stylesheet plus custom styles is shared by every
+    ReportGenerator; styles are only read while building documents.
+    """
+    styles = getSampleStyleSheet()
+    
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=30,
+        alignment=1  # Center
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2563eb'),
+        spaceAfter=12,
+        spaceBefore=12
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='ViolationTitle',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor('#dc2626'),
+        spaceAfter=6
+    ))
+    
+    return styles
+
 
 class ReportGenerator:
     """
     Generate professional ADA compliance reports
     """
     
+    # Rows shown in the cost breakdown table
+    MAX_BREAKDOWN_TYPES = 20
+    
+    # Column titles of the CSV export
+    CSV_HEADER = (
+        'Type', 'Severity', 'Priority', 'Location',
+        'Detected Value', 'Standard Value', 'Cost',
+        'Recommendation'
+    )
+    
     def __init__(self, output_dir: str = "reports"):
         """
         Initialize report generator
@@ -30,37 +174,9 @@ class ReportGenerator:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-        logger.info(f"Report generator initialized, output: {self.output_dir}")
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e40af'),
-            spaceAfter=30,
-            alignment=1  # Center
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#2563eb'),
-            spaceAfter=12,
-            spaceBefore=12
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='ViolationTitle',
-            parent=self.styles['Heading3'],
-            fontSize=12,
-            textColor=colors.HexColor('#dc2626'),
-            spaceAfter=6
-        ))
+        self.styles = _build_styles()
+        self._template_cache = {}
+        logger.info("Report generator initialized, output: %s", self.output_dir)
     
     def generate_pdf(
         self,
@@ -78,8 +194,7 @@ class ReportGenerator:
             Path to generated PDF file
         """
         if output_filename is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_filename = f"ada_compliance_report_{timestamp}.pdf"
+            output_filename = self._default_filename('ada_compliance_report', 'pdf')
         
         output_path = self.output_dir / output_filename
         
@@ -90,278 +205,287 @@ class ReportGenerator:
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
-            bottomMargin=18
+            bottomMargin=18,
+            # Deterministic output and zlib-compressed page streams
+            invariant=True,
+            pageCompression=1,
+            encrypt=None
         )
         
-        # Build content
-        story = []
+        # Group violations once for all sections
+        by_severity, type_stats, high_count = self._aggregate(results['violations'])
+        
+        # Build content, materializing the story once
+        story = list(itertools.chain(
+            self._create_title_page(results),
+            [PageBreak()],
+            self._create_executive_summary(results, high_count),
+            [PageBreak()],
+            self._create_violations_section(results, by_severity),
+            [PageBreak()],
+            self._create_cost_analysis(results, type_stats),
+            [PageBreak()],
+            self._create_recommendations(results)
+        ))
         
-        # Title page
-        story.extend(self._create_title_page(results))
-        story.append(PageBreak())
+        # Build PDF
+        doc.build(story)
         
-        # Executive summary
-        story.extend(self._create_executive_summary(results))
-        story.append(PageBreak())
+        logger.info("PDF report generated: %s", output_path)
+        return str(output_path)
+    
+    def generate_all(self, results: Dict) -> Dict[str, str]:
+        """
+        Generate the PDF report, CSV and GeoJSON exports concurrently
         
-        # Detailed violations
-        story.extend(self._create_violations_section(results))
-        story.append(PageBreak())
+        The exports are independent, so the CSV/GeoJSON writes overlap with
+        the PDF build. All three files share one run timestamp.
         
-        # Cost analysis
-        story.extend(self._create_cost_analysis(results))
-        story.append(PageBreak())
+        Args:
+            results: Analysis results dictionary
+            
+        Returns:
+            Paths keyed by 'pdf', 'csv' and 'geojson'
+        """
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                executor.submit(
+                    self.generate_pdf, results,
+                    self._default_filename('ada_compliance_report', 'pdf', run_id)
+                ): 'pdf',
+                executor.submit(
+                    self.export_csv, results,
+                    self._default_filename('violations', 'csv', run_id)
+                ): 'csv',
+                executor.submit(
+                    self.export_geojson, results,
+                    self._default_filename('violations', 'geojson', run_id)
+                ): 'geojson'
+            }
+            return {futures[future]: future.result() for future in as_completed(futures)}
+    
+    def _default_filename(self, kind: str, ext: str, run_id: str = None) -> str:
+        """
+        Build a timestamped output filename
         
-        # Recommendations
-        story.extend(self._create_recommendations(results))
+        Args:
+            kind: Filename prefix
+            ext: File extension
+            run_id: Shared timestamp for sibling exports (defaults to now)
+            
+        Returns:
+            Filename such as ``violations_20240101_120000.csv``
+        """
+        if run_id is None:
+            run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f"{kind}_{run_id}.{ext}"
+    
+    def _aggregate(
+        self,
+        violations: List[Dict]
+    ) -> Tuple[Dict[str, List[Violation]], Dict[str, Tuple[int, int]], int]:
+        """
+        Group violations for the report sections
         
-        # Build PDF
-        doc.build(story)
+        Args:
+            violations: List of violations
+            
+        Returns:
+            Violations by severity, (count, total cost) by type in order of
+            first appearance, and the number of High severity violations
+        """
+        table = ViolationTable.from_violations(violations)
+        high_count = int(table.severity_counts()[SEVERITY_CODES['High']])
         
-        logger.info(f"PDF report generated: {output_path}")
-        return str(output_path)
+        return table.by_severity(), table.type_stats(), high_count
     
-    def _create_title_page(self, results: Dict) -> List:
-        """Create report title page"""
-        elements = []
+    def _static_paragraph(self, key: str) -> Paragraph:
+        """
+        Get a fixed-text paragraph from the template cache
+        
+        The markup is parsed on first use only; each call returns a shallow
+        copy so layout state set during a build is not shared between
+        documents.
         
+        Args:
+            key: Entry of _STATIC_PARAGRAPHS
+            
+        Returns:
+            Paragraph ready to add to a story
+        """
+        paragraph = self._template_cache.get(key)
+        if paragraph is None:
+            text, style = _STATIC_PARAGRAPHS[key]
+            paragraph = Paragraph(text, self.styles[style])
+            self._template_cache[key] = paragraph
+        return copy.copy(paragraph)
+    
+    def _create_title_page(self, results: Dict) -> Iterator:
+        """Create report title page"""
         # Title
-        title = Paragraph(
-            "ADA Compliance Assessment Report",
-            self.styles['CustomTitle']
-        )
-        elements.append(title)
-        elements.append(Spacer(1, 0.3*inch))
+        yield self._static_paragraph('title')
+        yield Spacer(1, 0.3*inch)
         
         # Subtitle
-        subtitle = Paragraph(
-            "Pedestrian Infrastructure Evaluation",
-            self.styles['Heading2']
-        )
-        elements.append(subtitle)
-        elements.append(Spacer(1, 0.5*inch))
+        yield self._static_paragraph('subtitle')
+        yield Spacer(1, 0.5*inch)
         
         # Report details
         location = results.get('location', 'N/A')
         timestamp = results.get('timestamp', datetime.now().isoformat())
         
+        assessed_at = datetime.fromisoformat(timestamp)
+        
         details = [
             ['Location:', location],
-            ['Date:', datetime.fromisoformat(timestamp).strftime('%B %d, %Y')],
-            ['Time:', datetime.fromisoformat(timestamp).strftime('%I:%M %p')],
+            ['Date:', assessed_at.strftime('%B %d, %Y')],
+            ['Time:', assessed_at.strftime('%I:%M %p')],
             ['Compliance Score:', f"{results['compliance_score']}%"],
             ['Total Violations:', str(len(results['violations']))]
         ]
         
         table = Table(details, colWidths=[2*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#4b5563')),
-            ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#111827')),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 1*inch))
+        table.setStyle(_TITLE_TABLE_STYLE)
         
-        # Disclaimer
-        disclaimer = Paragraph(
-            "<i>This report was generated using AI-powered computer vision analysis. "
-            "All measurements and assessments should be verified by qualified professionals "
-            "before making final compliance decisions.</i>",
-            self.styles['Normal']
-        )
-        elements.append(disclaimer)
+        yield table
+        yield Spacer(1, 1*inch)
         
-        return elements
+        # Disclaimer
+        yield self._static_paragraph('disclaimer')
     
-    def _create_executive_summary(self, results: Dict) -> List:
+    def _create_executive_summary(self, results: Dict, high_count: int) -> Iterator:
         """Create executive summary section"""
-        elements = []
+        yield self._static_paragraph('summary_header')
+        yield Spacer(1, 0.2*inch)
         
-        elements.append(Paragraph("Executive Summary", self.styles['SectionHeader']))
-        elements.append(Spacer(1, 0.2*inch))
+        score = results['compliance_score']
+        num_violations = len(results['violations'])
         
         # Summary metrics
         summary_data = [
             ['Metric', 'Value', 'Status'],
-            ['Compliance Score', f"{results['compliance_score']}%", 
-             self._get_status(results['compliance_score'])],
-            ['Total Violations', str(len(results['violations'])),
-             'Critical' if len(results['violations']) > 5 else 'Moderate'],
-            ['Estimated Cost', f"${results['total_cost']:,}",
+            ['Compliance Score', f"{score}%", self._get_status(score)],
+            ['Total Violations', str(num_violations),
+             'Critical' if num_violations > 5 else 'Moderate'],
+            ['Estimated Cost', _fmt_money(results['total_cost']),
              'Budget Required'],
             ['Timeline', results['estimated_timeline'],
              'Planning Phase']
         ]
         
         table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 0.3*inch))
+        table.setStyle(_SUMMARY_TABLE_STYLE)
+        
+        yield table
+        yield Spacer(1, 0.3*inch)
         
         # Key findings
-        findings_text = self._generate_findings_text(results)
+        findings_text = self._generate_findings_text(results, high_count)
         findings = Paragraph(findings_text, self.styles['Normal'])
-        elements.append(findings)
-        
-        return elements
+        yield findings
     
-    def _create_violations_section(self, results: Dict) -> List:
+    def _create_violations_section(
+        self,
+        results: Dict,
+        by_severity: Dict[str, List[Violation]]
+    ) -> Iterator:
         """Create detailed violations section"""
-        elements = []
-        
-        elements.append(Paragraph("Detailed Violations", self.styles['SectionHeader']))
-        elements.append(Spacer(1, 0.2*inch))
+        yield self._static_paragraph('violations_header')
+        yield Spacer(1, 0.2*inch)
         
         violations = results['violations']
         
         if not violations:
-            elements.append(Paragraph(
-                "No ADA violations detected. Infrastructure meets compliance standards.",
-                self.styles['Normal']
-            ))
-            return elements
-        
-        # Group by severity
-        high = [v for v in violations if v['severity'] == 'High']
-        medium = [v for v in violations if v['severity'] == 'Medium']
-        low = [v for v in violations if v['severity'] == 'Low']
-        
-        for severity, viols in [('High', high), ('Medium', medium), ('Low', low)]:
+            yield self._static_paragraph('no_violations')
+            return
+        
+        for severity in ('High', 'Medium', 'Low'):
+            viols = by_severity.get(severity)
             if not viols:
                 continue
             
-            elements.append(Paragraph(
+            yield Paragraph(
                 f"{severity} Priority Violations ({len(viols)})",
                 self.styles['Heading3']
-            ))
-            elements.append(Spacer(1, 0.1*inch))
+            )
+            yield Spacer(1, 0.1*inch)
+            
+            # One table per severity bucket instead of one per violation
+            rows = []
+            separators = []
+            for violation in viols:
+                rows.extend((
+                    ['Type:', violation.type],
+                    ['Location:', violation.location],
+                    ['Detected:', violation.detected_value],
+                    ['ADA Standard:', violation.standard_value],
+                    ['Cost Estimate:', _fmt_money(violation.cost)],
+                    ['Recommendation:', violation.recommendation or 'Remediation required']
+                ))
+                # Gap below the last row of each violation
+                last = len(rows) - 1
+                separators.append(('BOTTOMPADDING', (0, last), (-1, last), 6 + 0.15*inch))
             
-            for i, violation in enumerate(viols, 1):
-                # Violation details
-                viol_data = [
-                    ['Type:', violation['type']],
-                    ['Location:', violation['location']],
-                    ['Detected:', violation['detected_value']],
-                    ['ADA Standard:', violation['standard_value']],
-                    ['Cost Estimate:', f"${violation['cost']:,}"],
-                    ['Recommendation:', violation.get('recommendation', 'Remediation required')]
-                ]
-                
-                table = Table(viol_data, colWidths=[1.5*inch, 4.5*inch])
-                table.setStyle(TableStyle([
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ]))
-                
-                elements.append(table)
-                elements.append(Spacer(1, 0.15*inch))
-        
-        return elements
+            table = Table(rows, colWidths=[1.5*inch, 4.5*inch])
+            table.setStyle(_VIOLATION_TABLE_STYLE)
+            table.setStyle(TableStyle(separators))
+            
+            yield table
     
-    def _create_cost_analysis(self, results: Dict) -> List:
+    def _create_cost_analysis(
+        self,
+        results: Dict,
+        type_stats: Dict[str, Tuple[int, int]]
+    ) -> Iterator:
         """Create cost analysis section"""
-        elements = []
-        
-        elements.append(Paragraph("Cost Analysis & Budget", self.styles['SectionHeader']))
-        elements.append(Spacer(1, 0.2*inch))
+        yield self._static_paragraph('cost_header')
+        yield Spacer(1, 0.2*inch)
         
-        # Cost breakdown by type
-        type_costs = {}
-        for violation in results['violations']:
-            viol_type = violation['type']
-            cost = violation.get('cost', 0)
-            type_costs[viol_type] = type_costs.get(viol_type, 0) + cost
+        total_cost = results['total_cost']
+        total_cost_text = _fmt_money(total_cost)
         
+        # Cost breakdown for the most expensive types
         breakdown_data = [['Violation Type', 'Count', 'Total Cost']]
-        for viol_type, cost in sorted(type_costs.items(), key=lambda x: x[1], reverse=True):
-            count = sum(1 for v in results['violations'] if v['type'] == viol_type)
-            breakdown_data.append([viol_type, str(count), f"${cost:,}"])
+        for viol_type, (count, cost) in heapq.nlargest(
+            self.MAX_BREAKDOWN_TYPES, type_stats.items(), key=lambda x: x[1][1]
+        ):
+            breakdown_data.append([viol_type, str(count), _fmt_money(cost)])
         
         # Add total row
         breakdown_data.append(['TOTAL', str(len(results['violations'])), 
-                              f"${results['total_cost']:,}"])
+                              total_cost_text])
         
         table = Table(breakdown_data, colWidths=[3*inch, 1*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#dbeafe')),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 0.3*inch))
+        table.setStyle(_BREAKDOWN_TABLE_STYLE)
+        
+        yield table
+        yield Spacer(1, 0.3*inch)
         
         # Budget recommendation
-        contingency = int(results['total_cost'] * 0.12)
+        contingency = int(total_cost * 0.12)
+        budget_total = total_cost + contingency
         budget_text = (
-            f"<b>Total Budget Required:</b> ${results['total_cost']:,}<br/>"
+            f"<b>Total Budget Required:</b> {total_cost_text}<br/>"
             f"<b>Recommended Contingency (12%):</b> ${contingency:,}<br/>"
-            f"<b>Total Project Budget:</b> ${results['total_cost'] + contingency:,}<br/>"
+            f"<b>Total Project Budget:</b> ${budget_total:,}<br/>"
             f"<b>Estimated Timeline:</b> {results['estimated_timeline']}"
         )
         
-        elements.append(Paragraph(budget_text, self.styles['Normal']))
-        
-        return elements
+        yield Paragraph(budget_text, self.styles['Normal'])
     
-    def _create_recommendations(self, results: Dict) -> List:
+    def _create_recommendations(self, results: Dict) -> Iterator:
         """Create recommendations section"""
-        elements = []
-        
-        elements.append(Paragraph("Recommendations & Next Steps", self.styles['SectionHeader']))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        recommendations = [
-            "1. <b>Immediate Actions</b> - Address all High priority violations within 30-60 days",
-            "2. <b>Phased Approach</b> - Develop multi-year capital improvement plan for Medium/Low priority items",
-            "3. <b>Grant Funding</b> - Apply for federal/state accessibility grants using this report",
-            "4. <b>Professional Verification</b> - Have licensed engineers verify measurements and costs",
-            "5. <b>Community Engagement</b> - Solicit input from disability advocacy groups",
-            "6. <b>Ongoing Monitoring</b> - Conduct annual accessibility audits",
-            "7. <b>Documentation</b> - Maintain records of all remediation efforts for compliance"
-        ]
+        yield self._static_paragraph('recommendations_header')
+        yield Spacer(1, 0.2*inch)
         
-        for rec in recommendations:
-            elements.append(Paragraph(rec, self.styles['Normal']))
-            elements.append(Spacer(1, 0.1*inch))
+        yield self._static_paragraph('recommendations')
         
-        elements.append(Spacer(1, 0.3*inch))
+        yield Spacer(1, 0.3*inch)
         
         # Contact info
-        contact = Paragraph(
-            "<b>For Questions or Support:</b><br/>"
-            "ADA Compliance Assessment System<br/>"
-            "Email: support@ada-compliance.com<br/>"
-            "Phone: (555) 123-4567",
-            self.styles['Normal']
-        )
-        elements.append(contact)
-        
-        return elements
+        yield self._static_paragraph('contact')
     
     def _get_status(self, score: int) -> str:
         """Get status text based on compliance score"""
@@ -374,7 +498,7 @@ class ReportGenerator:
         else:
             return 'Critical'
     
-    def _generate_findings_text(self, results: Dict) -> str:
+    def _generate_findings_text(self, results: Dict, high_priority: int) -> str:
         """Generate findings summary text"""
         score = results['compliance_score']
         num_violations = len(results['violations'])
@@ -388,8 +512,6 @@ class ReportGenerator:
         else:
             summary = "Critical compliance deficiencies were found that pose significant accessibility barriers."
         
-        high_priority = sum(1 for v in results['violations'] if v['severity'] == 'High')
-        
         if high_priority > 0:
             summary += f" There are {high_priority} high-priority violations requiring immediate attention."
         
@@ -409,37 +531,62 @@ class ReportGenerator:
         import csv
         
         if output_filename is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_filename = f"violations_{timestamp}.csv"
+            output_filename = self._default_filename('violations', 'csv')
         
         output_path = self.output_dir / output_filename
         
-        with open(output_path, 'w', newline='') as f:
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
-            
-            # Header
-            writer.writerow([
-                'Type', 'Severity', 'Priority', 'Location',
-                'Detected Value', 'Standard Value', 'Cost',
-                'Recommendation'
-            ])
-            
-            # Data rows
-            for violation in results['violations']:
-                writer.writerow([
-                    violation['type'],
-                    violation['severity'],
-                    violation['priority'],
-                    violation['location'],
-                    violation['detected_value'],
-                    violation['standard_value'],
-                    violation['cost'],
-                    violation.get('recommendation', '')
-                ])
-        
-        logger.info(f"CSV export generated: {output_path}")
+            writer.writerow(self.CSV_HEADER)
+            writer.writerows(self._csv_rows(results['violations']))
+        
+        logger.info("CSV export generated: %s", output_path)
         return str(output_path)
     
+    def iter_csv(self, results: Dict, batch_size: int = 256) -> Iterator[str]:
+        """
+        Stream violations as CSV text without writing a file
+        
+        Args:
+            results: Analysis results
+            batch_size: Rows encoded per yielded chunk
+            
+        Yields:
+            CSV text chunks, header first
+        """
+        import csv
+        import io
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.CSV_HEADER)
+        
+        rows = self._csv_rows(results['violations'])
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            if len(batch) < batch_size:
+                break
+            buffer.seek(0)
+            buffer.truncate(0)
+    
+    def _csv_rows(self, violations: List[Dict]) -> Iterator[Tuple]:
+        """CSV data rows matching CSV_HEADER"""
+        return (
+            (
+                v['type'],
+                v['severity'],
+                v['priority'],
+                v['location'],
+                v['detected_value'],
+                v['standard_value'],
+                v['cost'],
+                v.get('recommendation', '')
+            )
+            for v in violations
+        )
+    
     def export_geojson(self, results: Dict, output_filename: str = None) -> str:
         """
         Export violations to GeoJSON format for GIS integration
@@ -451,27 +598,64 @@ class ReportGenerator:
         Returns:
             Path to GeoJSON file
         """
-        import json
+        import orjson
         
         if output_filename is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_filename = f"violations_{timestamp}.geojson"
+            output_filename = self._default_filename('violations', 'geojson')
         
         output_path = self.output_dir / output_filename
         
-        # Create GeoJSON structure
+        # Create GeoJSON structure with violations as features
         geojson = {
             "type": "FeatureCollection",
-            "features": []
+            "features": self._geojson_features(results['violations'])
         }
         
-        # Add violations as features (with mock coordinates for demo)
-        for i, violation in enumerate(results['violations']):
-            feature = {
+        # Compact output from the C encoder; GIS tools do not need indentation
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(geojson, option=orjson.OPT_APPEND_NEWLINE))
+        
+        logger.info("GeoJSON export generated: %s", output_path)
+        return str(output_path)
+    
+    def iter_geojson(self, results: Dict) -> Iterator[bytes]:
+        """
+        Stream violations as a GeoJSON FeatureCollection without writing a file
+        
+        The bytes match export_geojson's file content.
+        
+        Args:
+            results: Analysis results
+            
+        Yields:
+            Encoded JSON fragments, one per feature
+        """
+        import orjson
+        
+        # Build the features before the first yield so bad input fails on
+        # the first chunk, before any bytes are sent
+        features = self._geojson_features(results['violations'])
+        
+        yield b'{"type":"FeatureCollection","features":['
+        separator = b''
+        for feature in features:
+            yield separator + orjson.dumps(feature)
+            separator = b','
+        yield b']}\n'
+    
+    def _geojson_features(self, violations: List[Dict]) -> List[Dict]:
+        """GeoJSON point features for violations"""
+        # Mock coordinates for demo, computed for all violations at once
+        offsets = np.arange(len(violations), dtype=np.float64) * 0.001
+        lons = (-122.4194 + offsets).tolist()
+        lats = (37.7749 + offsets).tolist()
+        
+        return [
+            {
                 "type": "Feature",
                 "geometry": {
                     "type": "Point",
-                    "coordinates": [-122.4194 + i*0.001, 37.7749 + i*0.001]  # Mock coords
+                    "coordinates": [lon, lat]
                 },
                 "properties": {
                     "type": violation['type'],
@@ -484,10 +668,5 @@ class ReportGenerator:
                     "recommendation": violation.get('recommendation', '')
                 }
             }
-            geojson["features"].append(feature)
-        
-        with open(output_path, 'w') as f:
-            json.dump(geojson, f, indent=2)
-        
-        logger.info(f"GeoJSON export generated: {output_path}")
-        return str(output_path)
+            for lon, lat, violation in zip(lons, lats, violations)
+        ]
@@ -0,0 +1,163 @@
+"""
+Violation Record Module
+Compact attribute-access records for compliance violations
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+# Severity code of each report bucket; other severities get len(SEVERITIES)
+SEVERITIES = ('High', 'Medium', 'Low')
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITIES)}
+
+# Remediation priority levels, most urgent first
+PRIORITIES = (1, 2, 3)
+
+
+@dataclass
+class Violation:
+    """
+    One compliance violation, as read by the report generator
+
+    ``__slots__`` is declared explicitly (``dataclass(slots=True)`` needs
+    Python 3.10) so fields are slot descriptors rather than dict entries.
+    """
+
+    __slots__ = (
+        'type', 'severity', 'priority', 'location', 'detected_value',
+        'standard_value', 'cost', 'recommendation'
+    )
+
+    type: str
+    severity: str
+    priority: int
+    location: str
+    detected_value: str
+    standard_value: str
+    cost: int
+    recommendation: Optional[str]
+
+    @classmethod
+    def from_dict(cls, violation: Dict) -> "Violation":
+        """Build from a violation dictionary of the public result format"""
+        return cls(
+            violation['type'],
+            violation['severity'],
+            violation.get('priority', 2),
+            violation['location'],
+            violation['detected_value'],
+            violation['standard_value'],
+            violation.get('cost', 0),
+            violation.get('recommendation')
+        )
+
+
+def normalize_violations(violations: Sequence[Union[Dict, Violation]]) -> List[Violation]:
+    """
+    Convert violation dictionaries to ``Violation`` records once
+
+    Args:
+        violations: Violation dictionaries or records
+
+    Returns:
+        List of ``Violation`` records (records are passed through)
+    """
+    from_dict = Violation.from_dict
+    return [
+        v if isinstance(v, Violation) else from_dict(v)
+        for v in violations
+    ]
+
+
+@dataclass
+class ViolationTable:
+    """
+    Violations stored as parallel NumPy arrays for report and chart aggregates
+
+    ``records`` keeps the row objects for the per-violation tables; counts
+    and cost sums are reduced over the columns in NumPy.
+    """
+
+    records: List[Violation]
+    costs: np.ndarray           # (N,) int64
+    severity_codes: np.ndarray  # (N,) int8, index into SEVERITIES
+    type_codes: np.ndarray      # (N,) int64, index into type_names
+    priorities: np.ndarray      # (N,) int64, entries of PRIORITIES
+    type_names: List[str]       # in order of first appearance
+
+    @classmethod
+    def from_violations(cls, violations: Sequence[Union[Dict, Violation]]) -> "ViolationTable":
+        """Transpose violations into columns"""
+        records = normalize_violations(violations)
+        n = len(records)
+        
+        unknown = len(SEVERITIES)
+        type_index = {}
+        
+        return cls(
+            records=records,
+            costs=np.fromiter((v.cost for v in records), dtype=np.int64, count=n),
+            severity_codes=np.fromiter(
+                (SEVERITY_CODES.get(v.severity, unknown) for v in records),
+                dtype=np.int8, count=n
+            ),
+            type_codes=np.fromiter(
+                (type_index.setdefault(v.type, len(type_index)) for v in records),
+                dtype=np.int64, count=n
+            ),
+            type_names=list(type_index),
+            priorities=np.fromiter((v.priority for v in records), dtype=np.int64, count=n)
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _sum_costs(self, codes: np.ndarray, size: int) -> np.ndarray:
+        """Integer cost totals per code (bincount weights would go through float64)"""
+        totals = np.zeros(size, dtype=np.int64)
+        np.add.at(totals, codes, self.costs)
+        return totals
+
+    def severity_counts(self) -> np.ndarray:
+        """Number of violations per entry of SEVERITIES"""
+        return np.bincount(self.severity_codes, minlength=len(SEVERITIES) + 1)[:len(SEVERITIES)]
+
+    def severity_costs(self) -> np.ndarray:
+        """Total cost per entry of SEVERITIES"""
+        return self._sum_costs(self.severity_codes, len(SEVERITIES) + 1)[:len(SEVERITIES)]
+
+    def priority_counts(self) -> np.ndarray:
+        """Number of violations per entry of PRIORITIES"""
+        return np.bincount(self.priorities, minlength=PRIORITIES[-1] + 1)[PRIORITIES[0]:PRIORITIES[-1] + 1]
+
+    def priority_costs(self) -> np.ndarray:
+        """Total cost per entry of PRIORITIES"""
+        return self._sum_costs(self.priorities, PRIORITIES[-1] + 1)[PRIORITIES[0]:PRIORITIES[-1] + 1]
+
+    def type_counts(self) -> np.ndarray:
+        """Number of violations per entry of type_names"""
+        return np.bincount(self.type_codes, minlength=len(self.type_names))
+
+    def type_severity_counts(self) -> np.ndarray:
+        """(types, SEVERITIES + unknown) matrix of violation counts"""
+        width = len(SEVERITIES) + 1
+        num_types = len(self.type_names)
+        return np.bincount(
+            self.type_codes * width + self.severity_codes,
+            minlength=num_types * width
+        ).reshape(num_types, width)
+
+    def by_severity(self) -> Dict[str, List[Violation]]:
+        """Records of each severity bucket, in input order"""
+        records = self.records
+        return {
+            name: [records[i] for i in np.flatnonzero(self.severity_codes == code).tolist()]
+            for code, name in enumerate(SEVERITIES)
+        }
+
+    def type_stats(self) -> Dict[str, Tuple[int, int]]:
+        """(count, total cost) per type, in order of first appearance"""
+        counts = self.type_counts()
+        totals = self._sum_costs(self.type_codes, len(self.type_names))
+        return dict(zip(self.type_names, zip(counts.tolist(), totals.tolist())))
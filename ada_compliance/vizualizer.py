@@ -3,25 +3,73 @@ Visualization Module
 Generate heatmaps, charts, and visual analysis tools
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-from typing import Dict, List
-import folium
-from folium.plugins import HeatMap
+from typing import Dict, List, TYPE_CHECKING
 import logging
 
+from .violations import PRIORITIES, SEVERITIES, SEVERITY_CODES, ViolationTable
+
+# matplotlib, seaborn and folium are imported on first use to keep
+# importing this module (e.g. from the API) cheap
+if TYPE_CHECKING:
+    import folium
+    from matplotlib.figure import Figure
+
 logger = logging.getLogger(__name__)
 
 
+def _hex_to_rgba(colors: List[str]) -> np.ndarray:
+    """Convert '#rrggbb' colors to an opaque float32 RGBA array"""
+    rgb = [[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in colors]
+    rgba = np.ones((len(colors), 4), dtype=np.float32)
+    rgba[:, :3] = np.asarray(rgb, dtype=np.float32).reshape(-1, 3) / 255
+    return rgba
+
+
+# Lookup tables indexed by severity code (SEVERITIES order, then unknown)
+SEVERITY_WEIGHTS = np.array([1.0, 0.6, 0.3, 0.5])
+SEVERITY_RGBA = _hex_to_rgba(['#ef4444', '#f59e0b', '#10b981'])
+
+# Bar colors indexed by priority - 1
+PRIORITY_RGBA = _hex_to_rgba(['#ef4444', '#f59e0b', '#10b981'])
+
+_theme_ready = False
+
+
+def _figure(**kwargs) -> "Figure":
+    """Create a Figure, loading matplotlib and the seaborn theme on first use"""
+    global _theme_ready
+    if not _theme_ready:
+        import matplotlib
+        matplotlib.use('Agg')  # Headless rendering; skip GUI backend probing
+        import seaborn as sns
+        sns.set_theme(style="whitegrid")
+        _theme_ready = True
+    
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
+
+
 class ResultVisualizer:
     """
     Create visualizations for ADA compliance analysis
     """
     
+    # Builds a circle marker from a [lat, lon, severity code, popup] row;
+    # colors follow SEVERITIES, with blue for unknown severities
+    MARKER_CALLBACK = """
+    function (row) {
+        var color = ['red', 'orange', 'yellow', 'blue'][row[2]];
+        var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+            radius: 8, color: color, fill: true, fillColor: color
+        });
+        marker.bindPopup(row[3]);
+        return marker;
+    }
+    """
+    
     def __init__(self):
         """Initialize visualizer"""
-        sns.set_theme(style="whitegrid")
         logger.info("Visualizer initialized")
     
     def create_compliance_heatmap(
@@ -29,7 +77,7 @@ class ResultVisualizer:
         violations_data: List[Dict],
         center_coords: tuple = (37.7749, -122.4194),
         zoom_start: int = 13
-    ) -> folium.Map:
+    ) -> "folium.Map":
         """
         Create interactive heatmap of violations
         
@@ -41,6 +89,9 @@ class ResultVisualizer:
         Returns:
             Folium map object
         """
+        import folium
+        from folium.plugins import FastMarkerCluster, HeatMap
+        
         # Create base map
         m = folium.Map(
             location=center_coords,
@@ -48,43 +99,34 @@ class ResultVisualizer:
             tiles='OpenStreetMap'
         )
         
-        # Prepare heatmap data
-        heat_data = []
-        for violation in violations_data:
-            # In real implementation, extract actual coordinates
-            # For demo, use mock coordinates
-            lat = center_coords[0] + np.random.uniform(-0.01, 0.01)
-            lon = center_coords[1] + np.random.uniform(-0.01, 0.01)
-            
-            # Weight by severity
-            weight = {'High': 1.0, 'Medium': 0.6, 'Low': 0.3}.get(
-                violation['severity'], 0.5
-            )
-            
-            heat_data.append([lat, lon, weight])
+        n = len(violations_data)
+        
+        # In real implementation, extract actual coordinates
+        # For demo, draw mock coordinates for all violations at once
+        coords = np.asarray(center_coords, dtype=np.float64) + np.random.uniform(-0.01, 0.01, (n, 2))
+        
+        # Weight by severity
+        unknown = len(SEVERITIES)
+        severity_codes = np.fromiter(
+            (SEVERITY_CODES.get(v['severity'], unknown) for v in violations_data),
+            dtype=np.intp, count=n
+        )
+        
+        heat_data = np.column_stack([coords, SEVERITY_WEIGHTS[severity_codes]]).tolist()
         
         # Add heatmap layer
         HeatMap(heat_data).add_to(m)
         
-        # Add violation markers
-        for i, violation in enumerate(violations_data):
-            lat = center_coords[0] + np.random.uniform(-0.01, 0.01)
-            lon = center_coords[1] + np.random.uniform(-0.01, 0.01)
-            
-            color = {
-                'High': 'red',
-                'Medium': 'orange',
-                'Low': 'yellow'
-            }.get(violation['severity'], 'blue')
-            
-            folium.CircleMarker(
-                location=[lat, lon],
-                radius=8,
-                popup=f"{violation['type']}<br/>{violation['location']}",
-                color=color,
-                fill=True,
-                fillColor=color
-            ).add_to(m)
+        # Add violation markers at the same points as the heatmap; markers
+        # are built client-side from one flat array instead of a folium
+        # object (and template render) per violation
+        marker_data = [
+            [lat, lon, code, f"{violation['type']}<br/>{violation['location']}"]
+            for violation, (lat, lon), code in zip(
+                violations_data, coords.tolist(), severity_codes.tolist()
+            )
+        ]
+        FastMarkerCluster(marker_data, callback=self.MARKER_CALLBACK).add_to(m)
         
         logger.info(f"Generated heatmap with {len(violations_data)} violations")
         return m
@@ -92,7 +134,8 @@ class ResultVisualizer:
     def plot_violation_distribution(
         self,
         violations: List[Dict],
-        save_path: str = None
+        save_path: str = None,
+        dpi: int = 150
     ):
         """
         Create bar chart of violation types
@@ -100,42 +143,32 @@ class ResultVisualizer:
         Args:
             violations: List of violations
             save_path: Path to save figure (optional)
+            dpi: Output resolution (use 300 for print)
         """
-        # Count violations by type
-        type_counts = {}
-        for v in violations:
-            vtype = v['type']
-            type_counts[vtype] = type_counts.get(vtype, 0) + 1
-        
-        # Sort by count
-        sorted_types = sorted(type_counts.items(), key=lambda x: x[1], reverse=True)
-        types = [t[0] for t in sorted_types]
-        counts = [t[1] for t in sorted_types]
+        # Count violations by type and severity over the columnar table
+        table = ViolationTable.from_violations(violations)
+        type_counts = table.type_counts()
         
-        # Create plot
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.barh(types, counts, color='steelblue')
+        # Sort by count (stable, so ties keep first-appearance order)
+        order = np.argsort(-type_counts, kind='stable')
+        types = [table.type_names[i] for i in order.tolist()]
+        counts = type_counts[order].tolist()
         
+        # Typical severity for each type (ties go to the more severe level)
+        dominant = table.type_severity_counts()[order, :len(SEVERITIES)].argmax(axis=1)
+        
+        # Create plot
+        fig = _figure(figsize=(10, 6), layout='constrained')
+        ax = fig.subplots()
         # Color by severity
-        for i, vtype in enumerate(types):
-            # Find typical severity for this type
-            severity_counts = {'High': 0, 'Medium': 0, 'Low': 0}
-            for v in violations:
-                if v['type'] == vtype:
-                    severity_counts[v['severity']] += 1
-            
-            dominant_severity = max(severity_counts.items(), key=lambda x: x[1])[0]
-            color = {'High': '#ef4444', 'Medium': '#f59e0b', 'Low': '#10b981'}[dominant_severity]
-            bars[i].set_color(color)
+        ax.barh(types, counts, color=SEVERITY_RGBA[dominant])
         
         ax.set_xlabel('Number of Violations', fontsize=12)
         ax.set_title('ADA Violations by Type', fontsize=14, fontweight='bold')
         ax.grid(axis='x', alpha=0.3)
         
-        plt.tight_layout()
-        
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi)
             logger.info(f"Saved violation distribution plot to {save_path}")
         
         return fig
@@ -143,7 +176,8 @@ class ResultVisualizer:
     def plot_cost_by_severity(
         self,
         violations: List[Dict],
-        save_path: str = None
+        save_path: str = None,
+        dpi: int = 150
     ):
         """
         Create pie chart of costs by severity
@@ -151,35 +185,27 @@ class ResultVisualizer:
         Args:
             violations: List of violations
             save_path: Path to save figure (optional)
+            dpi: Output resolution (use 300 for print)
         """
         # Calculate costs by severity
-        severity_costs = {'High': 0, 'Medium': 0, 'Low': 0}
-        for v in violations:
-            severity_costs[v['severity']] += v.get('cost', 0)
+        table = ViolationTable.from_violations(violations)
+        severity_costs = table.severity_costs()
         
         # Filter out zero values
-        labels = []
-        sizes = []
-        colors_list = []
-        
-        color_map = {
-            'High': '#ef4444',
-            'Medium': '#f59e0b',
-            'Low': '#10b981'
-        }
-        
-        for severity in ['High', 'Medium', 'Low']:
-            if severity_costs[severity] > 0:
-                labels.append(f"{severity} (${severity_costs[severity]:,})")
-                sizes.append(severity_costs[severity])
-                colors_list.append(color_map[severity])
+        present = np.flatnonzero(severity_costs > 0)
+        sizes = severity_costs[present].tolist()
+        labels = [
+            f"{SEVERITIES[code]} (${cost:,})"
+            for code, cost in zip(present.tolist(), sizes)
+        ]
         
         # Create plot
-        fig, ax = plt.subplots(figsize=(8, 8))
+        fig = _figure(figsize=(8, 8), layout='constrained')
+        ax = fig.subplots()
         wedges, texts, autotexts = ax.pie(
             sizes,
             labels=labels,
-            colors=colors_list,
+            colors=SEVERITY_RGBA[present],
             autopct='%1.1f%%',
             startangle=90,
             textprops={'fontsize': 11}
@@ -192,10 +218,8 @@ class ResultVisualizer:
         
         ax.set_title('Remediation Cost by Severity', fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
-        
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi)
             logger.info(f"Saved cost distribution plot to {save_path}")
         
         return fig
@@ -203,7 +227,8 @@ class ResultVisualizer:
     def plot_priority_timeline(
         self,
         violations: List[Dict],
-        save_path: str = None
+        save_path: str = None,
+        dpi: int = 150
     ):
         """
         Create timeline visualization for remediation priorities
@@ -211,28 +236,24 @@ class ResultVisualizer:
         Args:
             violations: List of violations
             save_path: Path to save figure (optional)
+            dpi: Output resolution (use 300 for print)
         """
-        # Group by priority
-        priority_groups = {1: [], 2: [], 3: []}
-        for v in violations:
-            priority = v.get('priority', 2)
-            priority_groups[priority].append(v)
-        
-        # Calculate cumulative costs
-        priorities = []
-        costs = []
-        colors_list = []
-        
-        for priority in [1, 2, 3]:
-            if priority_groups[priority]:
-                total_cost = sum(v.get('cost', 0) for v in priority_groups[priority])
-                priorities.append(f"Priority {priority}")
-                costs.append(total_cost)
-                colors_list.append(['#ef4444', '#f59e0b', '#10b981'][priority-1])
+        # Count and total costs by priority
+        table = ViolationTable.from_violations(violations)
+        
+        # Calculate cumulative costs for the priorities that occur
+        present = table.priority_counts() > 0
+        priority_ids = np.asarray(PRIORITIES)[present]
+        priorities = [f"Priority {priority}" for priority in priority_ids.tolist()]
+        costs = table.priority_costs()[present].tolist()
         
         # Create plot
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.bar(priorities, costs, color=colors_list, edgecolor='black', linewidth=1.5)
+        fig = _figure(figsize=(10, 6), layout='constrained')
+        ax = fig.subplots()
+        bars = ax.bar(
+            priorities, costs, color=PRIORITY_RGBA[priority_ids - 1],
+            edgecolor='black', linewidth=1.5
+        )
         
         # Add value labels on bars
         for bar in bars:
@@ -251,10 +272,8 @@ class ResultVisualizer:
         ax.set_title('Remediation Cost by Priority Level', fontsize=14, fontweight='bold')
         ax.grid(axis='y', alpha=0.3)
         
-        plt.tight_layout()
-        
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi)
             logger.info(f"Saved priority timeline plot to {save_path}")
         
         return fig
@@ -262,7 +281,8 @@ class ResultVisualizer:
     def generate_dashboard(
         self,
         results: Dict,
-        output_path: str = "dashboard.png"
+        output_path: str = "dashboard.png",
+        dpi: int = 150
     ):
         """
         Generate comprehensive dashboard with multiple visualizations
@@ -270,20 +290,22 @@ class ResultVisualizer:
         Args:
             results: Analysis results
             output_path: Path to save dashboard
+            dpi: Output resolution (use 300 for print)
         """
         violations = results['violations']
         
+        # Aggregate everything the panels need from one columnar table
+        table = ViolationTable.from_violations(violations)
+        type_counts = dict(zip(table.type_names, table.type_counts().tolist()))
+        severity_costs = dict(zip(SEVERITIES, table.severity_costs().tolist()))
+        priority_counts = dict(zip(PRIORITIES, table.priority_counts().tolist()))
+        
         # Create figure with subplots
-        fig = plt.figure(figsize=(16, 10))
-        gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+        fig = _figure(figsize=(16, 10), layout='constrained')
+        gs = fig.add_gridspec(2, 2)
         
         # 1. Violation distribution
         ax1 = fig.add_subplot(gs[0, 0])
-        type_counts = {}
-        for v in violations:
-            vtype = v['type']
-            type_counts[vtype] = type_counts.get(vtype, 0) + 1
-        
         sorted_types = sorted(type_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         types = [t[0] for t in sorted_types]
         counts = [t[1] for t in sorted_types]
@@ -295,11 +317,7 @@ class ResultVisualizer:
         
         # 2. Cost by severity
         ax2 = fig.add_subplot(gs[0, 1])
-        severity_costs = {'High': 0, 'Medium': 0, 'Low': 0}
-        for v in violations:
-            severity_costs[v['severity']] += v.get('cost', 0)
-        
-        colors = ['#ef4444', '#f59e0b', '#10b981']
+        colors = SEVERITY_RGBA
         ax2.pie(
             [severity_costs[s] for s in ['High', 'Medium', 'Low']],
             labels=[f"{s}\n${severity_costs[s]:,}" for s in ['High', 'Medium', 'Low']],
@@ -311,14 +329,10 @@ class ResultVisualizer:
         
         # 3. Priority distribution
         ax3 = fig.add_subplot(gs[1, 0])
-        priority_counts = {1: 0, 2: 0, 3: 0}
-        for v in violations:
-            priority_counts[v.get('priority', 2)] += 1
-        
         ax3.bar(
             ['Priority 1', 'Priority 2', 'Priority 3'],
             [priority_counts[p] for p in [1, 2, 3]],
-            color=['#ef4444', '#f59e0b', '#10b981']
+            color=PRIORITY_RGBA
         )
         ax3.set_ylabel('Count')
         ax3.set_title('Violations by Priority', fontweight='bold')
@@ -356,7 +370,7 @@ class ResultVisualizer:
             fontweight='bold'
         )
         
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.savefig(output_path, dpi=dpi)
         logger.info(f"Saved dashboard to {output_path}")
         
         return fig
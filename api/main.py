@@ -2,11 +2,19 @@
 FastAPI REST API for ADA Compliance Assessment System
 """
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Literal, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import itertools
+import os
+import tempfile
+import time
+import uuid
 import cv2
 import numpy as np
 from pathlib import Path
@@ -15,16 +23,38 @@ from datetime import datetime
 
 from ada_compliance.analyzer import ComplianceAnalyzer
 from ada_compliance.report_generator import ReportGenerator
+from ada_compliance.vizualizer import ResultVisualizer
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optional libjpeg-turbo decoder for JPEG uploads (falls back to OpenCV)
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError) as e:
+    logger.warning(f"TurboJPEG unavailable, decoding uploads with OpenCV: {e}")
+    turbo_jpeg = None
+
+UPLOAD_CHUNK_SIZE = 1 << 20
+STATS_TTL_SECONDS = 60
+STATS_CACHE_SIZE = 128
+JPEG_MAGIC = b'\xff\xd8'
+
+# Heatmap jobs: <id>.pending while building, then <id>.html or <id>.error.
+# Files older than HEATMAP_TTL_SECONDS are deleted; a job still pending after
+# HEATMAP_PENDING_TIMEOUT is reported as failed (e.g. the worker restarted)
+HEATMAP_DIR = Path(tempfile.gettempdir()) / "ada_heatmaps"
+HEATMAP_TTL_SECONDS = 3600
+HEATMAP_PENDING_TIMEOUT = 600
+
 # Initialize FastAPI app
 app = FastAPI(
     title="ADA Compliance Assessment API",
     description="AI-powered pedestrian infrastructure assessment",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -36,17 +66,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON/CSV/GeoJSON responses above 1 KB
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Split the host's cores between server worker processes, e.g.
+#   WEB_CONCURRENCY=4 uvicorn api.main:app --workers 4 --loop uvloop --http httptools
+WORKERS = int(os.getenv('WEB_CONCURRENCY', 1))
+THREADS = max(1, (os.cpu_count() or 1) // WORKERS)
+
+# Concurrent batch analyses. Inference itself is serialized inside the
+# analyzer; the workers overlap decoding and measurement with it. Each
+# worker's torch/OpenCV pools get an equal share of THREADS, so the
+# process never runs more than THREADS compute threads.
+ANALYSIS_WORKERS = min(2, THREADS)
+
 # Initialize components
-analyzer = ComplianceAnalyzer()
+analyzer = ComplianceAnalyzer(num_threads=max(1, THREADS // ANALYSIS_WORKERS))
 report_gen = ReportGenerator()
+visualizer = ResultVisualizer()
+HEATMAP_DIR.mkdir(parents=True, exist_ok=True)
+
+# Worker threads for blocking decode + analysis (OpenCV/torch release the GIL)
+analysis_pool = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS)
+
+# Statistics responses keyed by (start_date, end_date): (computed_at, stats)
+stats_cache: Dict[Tuple[Optional[str], Optional[str]], Tuple[float, Dict]] = {}
 
 # Pydantic models
+class Violation(BaseModel):
+    # Typed fields serialize through pydantic-core; extra keys are kept
+    model_config = ConfigDict(from_attributes=True, extra='allow')
+    
+    type: str
+    severity: Literal['High', 'Medium', 'Low']
+    location: str
+    detected_value: str
+    standard_value: str
+    priority: int = 2
+    cost: int = 0
+    recommendation: Optional[str] = None
+    reference: Optional[str] = None
+    bbox: Optional[List[float]] = None
+    labor_hours: Optional[int] = None
+
 class AnalysisResponse(BaseModel):
     compliance_score: int
     total_violations: int
     total_cost: int
     estimated_timeline: str
-    violations: List[dict]
+    violations: List[Violation]
     timestamp: str
 
 class HealthCheck(BaseModel):
@@ -55,6 +123,58 @@ class HealthCheck(BaseModel):
     timestamp: str
 
 
+async def read_upload(file: UploadFile) -> bytearray:
+    """Read an upload in fixed-size chunks into a single buffer"""
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buffer.extend(chunk)
+    return buffer
+
+
+def decode_image(contents: bytearray) -> Optional[np.ndarray]:
+    """
+    Decode uploaded image bytes to a BGR array
+    
+    JPEGs go through TurboJPEG when available; other formats (and JPEGs
+    it rejects) use cv2.imdecode.
+    
+    Args:
+        contents: Encoded image bytes
+        
+    Returns:
+        BGR image, or None if the bytes cannot be decoded
+    """
+    if turbo_jpeg is not None and contents[:2] == JPEG_MAGIC:
+        try:
+            return turbo_jpeg.decode(contents, pixel_format=TJPF_BGR)
+        except OSError as e:
+            logger.warning(f"TurboJPEG decode failed, retrying with OpenCV: {e}")
+    
+    return cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+
+
+def decode_and_analyze(contents: bytearray, filename: str) -> Optional[Dict]:
+    """
+    Decode and analyze one batch upload (runs on the analysis pool)
+    
+    Args:
+        contents: Encoded image bytes
+        filename: Upload filename, copied into the result
+        
+    Returns:
+        Serializable analysis result, or None if the image is invalid
+    """
+    image = decode_image(contents)
+    if image is None:
+        return None
+    
+    result = analyzer.analyze(image, annotate=False)
+    result['filename'] = filename
+    # Remove non-serializable items
+    result.pop('annotated_image', None)
+    return result
+
+
 @app.get("/", response_model=HealthCheck)
 async def root():
     """Health check endpoint"""
@@ -65,7 +185,11 @@ async def root():
     }
 
 
-@app.post("/api/v1/analyze", response_model=AnalysisResponse)
+@app.post(
+    "/api/v1/analyze",
+    response_model=AnalysisResponse,
+    response_model_exclude_unset=True
+)
 async def analyze_image(
     file: UploadFile = File(...),
     location: Optional[str] = Form(None),
@@ -86,9 +210,8 @@ async def analyze_image(
     """
     try:
         # Read and decode image
-        contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        contents = await read_upload(file)
+        image = decode_image(contents)
         
         if image is None:
             raise HTTPException(status_code=400, detail="Invalid image file")
@@ -98,7 +221,8 @@ async def analyze_image(
         results = analyzer.analyze(
             image,
             confidence_threshold=confidence_threshold,
-            location=location
+            location=location,
+            annotate=False
         )
         
         # Generate report if requested
@@ -138,22 +262,18 @@ async def batch_analyze(
         List of analysis results
     """
     try:
-        results = []
+        # Read all uploads concurrently, then analyze them off the event loop
+        contents = await asyncio.gather(*(read_upload(file) for file in files))
         
-        for file in files:
-            contents = await file.read()
-            nparr = np.frombuffer(contents, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if image is not None:
-                result = analyzer.analyze(image)
-                result['filename'] = file.filename
-                # Remove non-serializable items
-                result.pop('annotated_image', None)
-                results.append(result)
+        loop = asyncio.get_running_loop()
+        analyzed = await asyncio.gather(*(
+            loop.run_in_executor(analysis_pool, decode_and_analyze, data, file.filename)
+            for data, file in zip(contents, files)
+        ))
+        results = [result for result in analyzed if result is not None]
         
         logger.info(f"Batch analysis complete: {len(results)} images processed")
-        return JSONResponse(content={"results": results})
+        return ORJSONResponse(content={"results": results})
         
     except Exception as e:
         logger.error(f"Error in batch analysis: {str(e)}")
@@ -168,6 +288,9 @@ async def get_statistics(
     """
     Get compliance statistics
     
+    Responses are cached per date range for STATS_TTL_SECONDS, so repeated
+    dashboard polls skip the query.
+    
     Args:
         start_date: Start date filter (ISO format)
         end_date: End date filter (ISO format)
@@ -175,6 +298,29 @@ async def get_statistics(
     Returns:
         Statistical summary
     """
+    key = (start_date, end_date)
+    now = time.monotonic()
+    
+    cached = stats_cache.get(key)
+    if cached is not None and now - cached[0] < STATS_TTL_SECONDS:
+        return cached[1]
+    
+    stats = await compute_statistics(start_date, end_date)
+    
+    # Evict the oldest entry when full (dicts keep insertion order)
+    stats_cache.pop(key, None)
+    if len(stats_cache) >= STATS_CACHE_SIZE:
+        stats_cache.pop(next(iter(stats_cache)))
+    stats_cache[key] = (now, stats)
+    
+    return stats
+
+
+async def compute_statistics(
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> Dict:
+    """Compute the statistical summary for a date range"""
     # In production, this would query database
     # For demo, return mock statistics
     return {
@@ -229,14 +375,18 @@ async def export_csv(
         results: Analysis results dictionary
         
     Returns:
-        CSV file
+        CSV file, streamed as it is encoded
     """
     try:
-        csv_path = report_gen.export_csv(results)
-        return FileResponse(
-            csv_path,
+        filename = report_gen._default_filename('violations', 'csv')
+        # Generators are lazy: encode the first chunk here so invalid
+        # results fail with a 500 instead of a truncated download
+        chunks = report_gen.iter_csv(results)
+        first = next(chunks)
+        return StreamingResponse(
+            itertools.chain([first], chunks),
             media_type='text/csv',
-            filename=Path(csv_path).name
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
     except Exception as e:
         logger.error(f"Error exporting CSV: {str(e)}")
@@ -254,20 +404,118 @@ async def export_geojson(
         results: Analysis results dictionary
         
     Returns:
-        GeoJSON file
+        GeoJSON file, streamed as it is encoded
     """
     try:
-        geojson_path = report_gen.export_geojson(results)
-        return FileResponse(
-            geojson_path,
+        filename = report_gen._default_filename('violations', 'geojson')
+        # Generators are lazy: encode the first chunk here so invalid
+        # results fail with a 500 instead of a truncated download
+        chunks = report_gen.iter_geojson(results)
+        first = next(chunks)
+        return StreamingResponse(
+            itertools.chain([first], chunks),
             media_type='application/geo+json',
-            filename=Path(geojson_path).name
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
     except Exception as e:
         logger.error(f"Error exporting GeoJSON: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def purge_heatmaps():
+    """Delete heatmap job files older than HEATMAP_TTL_SECONDS"""
+    cutoff = time.time() - HEATMAP_TTL_SECONDS
+    for path in HEATMAP_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            # Removed by a concurrent request
+            continue
+
+
+def build_heatmap(job_id: str, violations: List[Dict]):
+    """
+    Render a heatmap job to HTML (runs after the response is sent)
+    
+    Args:
+        job_id: Job identifier used for the output files
+        violations: Violations to plot
+    """
+    pending_path = HEATMAP_DIR / f"{job_id}.pending"
+    try:
+        heatmap = visualizer.create_compliance_heatmap(violations)
+        heatmap.save(str(HEATMAP_DIR / f"{job_id}.html"))
+    except Exception as e:
+        logger.error(f"Error building heatmap {job_id}: {str(e)}")
+        (HEATMAP_DIR / f"{job_id}.error").write_text(str(e))
+    finally:
+        pending_path.unlink(missing_ok=True)
+
+
+@app.post("/api/v1/heatmap", status_code=202)
+async def create_heatmap(
+    results: dict,
+    background_tasks: BackgroundTasks
+):
+    """
+    Start building a violation heatmap in the background
+    
+    Args:
+        results: Analysis results dictionary
+        
+    Returns:
+        Job id to poll at /api/v1/heatmap/{job_id}
+    """
+    purge_heatmaps()
+    
+    job_id = uuid.uuid4().hex
+    (HEATMAP_DIR / f"{job_id}.pending").touch()
+    background_tasks.add_task(build_heatmap, job_id, results.get('violations', []))
+    return {"job_id": job_id, "status": "pending"}
+
+
+@app.get("/api/v1/heatmap/{job_id}")
+async def get_heatmap(job_id: str):
+    """
+    Get a heatmap job's status, or the map once it is built
+    
+    Args:
+        job_id: Id returned by POST /api/v1/heatmap
+        
+    Returns:
+        HTML map when done, otherwise the job status
+    """
+    try:
+        job_id = uuid.UUID(hex=job_id).hex
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Unknown heatmap job")
+    
+    html_path = HEATMAP_DIR / f"{job_id}.html"
+    if html_path.exists():
+        return FileResponse(html_path, media_type='text/html')
+    
+    error_path = HEATMAP_DIR / f"{job_id}.error"
+    pending_path = HEATMAP_DIR / f"{job_id}.pending"
+    try:
+        pending_age = time.time() - pending_path.stat().st_mtime
+    except FileNotFoundError:
+        pending_age = None
+    
+    if pending_age is not None:
+        if pending_age < HEATMAP_PENDING_TIMEOUT:
+            return ORJSONResponse({"job_id": job_id, "status": "pending"}, status_code=202)
+        # The background task never finished; record it as failed
+        logger.error(f"Heatmap job {job_id} timed out after {pending_age:.0f}s")
+        error_path.write_text("Heatmap job timed out")
+        pending_path.unlink(missing_ok=True)
+    
+    if error_path.exists():
+        raise HTTPException(status_code=500, detail=error_path.read_text())
+    
+    raise HTTPException(status_code=404, detail="Unknown heatmap job")
+
+
 @app.get("/api/v1/health")
 async def health_check():
     """Detailed health check"""
@@ -290,5 +538,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     )
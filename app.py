@@ -6,18 +6,20 @@ Main application entry point for interactive web interface
 import streamlit as st
 import cv2
 import numpy as np
-from PIL import Image
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from pathlib import Path
-import json
 from datetime import datetime
+from typing import Optional
+
+# pandas and plotly are imported inside the functions that use them, so the
+# header, sidebar and upload tab render before those modules finish loading
 
 # Import custom modules
 from ada_compliance.analyzer import ComplianceAnalyzer
 from ada_compliance.visualizer import ResultVisualizer
 from ada_compliance.report_generator import ReportGenerator
+from ada_compliance.violations import SEVERITIES, SEVERITY_CODES, ViolationTable
+
+LOGO_PATH = Path("assets/logo.png")
 
 # Page config
 st.set_page_config(
@@ -42,13 +44,227 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
+# Heavyweight components are built once per server process; Streamlit
+# reruns the script on every widget interaction
+@st.cache_resource
+def get_analyzer():
+    """Shared compliance analyzer (loads the detection model)"""
+    return ComplianceAnalyzer()
+
+
+@st.cache_resource
+def get_visualizer():
+    """Shared result visualizer"""
+    return ResultVisualizer()
+
+
+@st.cache_resource
+def get_report_generator():
+    """Shared PDF report generator"""
+    return ReportGenerator()
+
+
+def decode_upload(image_bytes: bytes) -> Optional[np.ndarray]:
+    """Decode uploaded bytes straight to the BGR array the analyzer expects"""
+    return cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def cached_analyze(image_bytes: bytes, confidence: float):
+    """
+    Decode and analyze an uploaded image, memoized on its bytes and threshold
+    
+    Only the detection/violation payload is cached: no annotated image
+    (a full-resolution frame per entry), and no location or timestamp,
+    which the caller sets per run so editing the label skips inference.
+    
+    Args:
+        image_bytes: Encoded image file contents
+        confidence: Detection confidence threshold
+        
+    Returns:
+        Analysis results without 'annotated_image', 'location' and
+        'timestamp', or None if the bytes cannot be decoded
+    """
+    img_array = decode_upload(image_bytes)
+    if img_array is None:
+        return None
+    
+    results = get_analyzer().analyze(
+        img_array,
+        confidence_threshold=confidence,
+        annotate=False
+    )
+    for key in ('annotated_image', 'location', 'timestamp'):
+        results.pop(key, None)
+    return results
+
+
+def _to_display_jpeg(bgr: np.ndarray, max_width: int = 1600, quality: int = 85) -> bytes:
+    """
+    Downscale a BGR image to display width and encode it as JPEG
+    
+    Args:
+        bgr: Image array (BGR)
+        max_width: Widest image sent to the browser
+        quality: JPEG quality (0-100)
+        
+    Returns:
+        Encoded JPEG bytes
+    """
+    height, width = bgr.shape[:2]
+    if width > max_width:
+        bgr = cv2.resize(
+            bgr, (max_width, round(height * max_width / width)),
+            interpolation=cv2.INTER_AREA
+        )
+    
+    ok, encoded = cv2.imencode('.jpg', bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return encoded.tobytes()
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def violations_to_csv(violations) -> bytes:
+    """CSV export of a violation list, memoized on its contents"""
+    import pandas as pd
+    
+    return pd.DataFrame(violations).to_csv(index=False).encode()
+
+
+# Figure builders are memoized on their (hashable) inputs, so reruns with
+# unchanged data skip Plotly figure construction and validation
+@st.cache_data(show_spinner=False)
+def build_risk_map():
+    """Sample risk map of the heatmap tab"""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(data=go.Scattermapbox(
+        lat=[37.7749, 37.7849, 37.7649],
+        lon=[-122.4194, -122.4094, -122.4294],
+        mode='markers',
+        marker=dict(
+            size=20,
+            color=['red', 'yellow', 'green'],
+            opacity=0.7
+        ),
+        text=['High Risk', 'Medium Risk', 'Low Risk']
+    ))
+    
+    fig.update_layout(
+        mapbox_style="open-street-map",
+        mapbox_center_lat=37.7749,
+        mapbox_center_lon=-122.4194,
+        mapbox_zoom=12,
+        height=500
+    )
+    return fig
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_type_pie(names: tuple, counts: tuple):
+    """Pie chart of violation counts by type"""
+    import plotly.express as px
+    
+    return px.pie(
+        values=list(counts),
+        names=list(names),
+        title="Most Common Violations"
+    )
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_severity_bar(severities: tuple, costs: tuple, counts: tuple):
+    """Bar chart of remediation cost by severity"""
+    import pandas as pd
+    import plotly.express as px
+    
+    severity_costs = pd.DataFrame({
+        'Severity': list(severities),
+        'Total Cost': list(costs),
+        'Count': list(counts)
+    })
+    
+    return px.bar(
+        severity_costs,
+        x='Severity',
+        y='Total Cost',
+        color='Severity',
+        color_discrete_map={
+            'High': 'red',
+            'Medium': 'orange',
+            'Low': 'green'
+        },
+        title="Remediation Cost by Severity"
+    )
+
+
+def accumulate_totals(totals: dict, table: ViolationTable):
+    """
+    Add one result's per-type and per-severity aggregates to running totals
+    
+    Args:
+        totals: Session totals ('type_counts' dict, 'severity_counts' and
+            'severity_costs' arrays in SEVERITIES order)
+        table: Violations of the new result
+    """
+    type_counts = totals['type_counts']
+    for name, count in zip(table.type_names, table.type_counts().tolist()):
+        type_counts[name] = type_counts.get(name, 0) + count
+    
+    totals['severity_counts'] += table.severity_counts()
+    totals['severity_costs'] += table.severity_costs()
+
+
+def filter_violations(table: ViolationTable, severities, min_cost, sort_by) -> np.ndarray:
+    """
+    Select and order violations over the columnar table
+    
+    Args:
+        table: Violations of the current result
+        severities: Severity names to keep
+        min_cost: Minimum remediation cost
+        sort_by: "Priority", "Cost" or "Type"
+        
+    Returns:
+        Indices into the result's violation list, in display order
+    """
+    codes = [SEVERITY_CODES[s] for s in severities if s in SEVERITY_CODES]
+    keep = np.flatnonzero(np.isin(table.severity_codes, codes) & (table.costs >= min_cost))
+    
+    # Stable sorts, so ties keep detection order
+    if sort_by == "Priority":
+        key = table.priorities[keep]
+    elif sort_by == "Cost":
+        key = -table.costs[keep]
+    else:
+        # Alphabetical rank of each type code
+        names = table.type_names
+        type_rank = np.empty(len(names), dtype=np.int64)
+        type_rank[sorted(range(len(names)), key=names.__getitem__)] = np.arange(len(names))
+        key = type_rank[table.type_codes[keep]]
+    
+    return keep[np.argsort(key, kind='stable')]
+
+
+@st.cache_resource
+def has_logo() -> bool:
+    """Whether the header logo exists, checked once per process
+    
+    Streamlit re-executes this script on every rerun, so a module-level
+    check would still stat the file each time.
+    """
+    return LOGO_PATH.exists()
+
+
 class ADAComplianceApp:
     """Main application class for ADA Compliance System"""
     
     def __init__(self):
-        self.analyzer = ComplianceAnalyzer()
-        self.visualizer = ResultVisualizer()
-        self.report_gen = ReportGenerator()
+        self.analyzer = get_analyzer()
+        self.visualizer = get_visualizer()
+        self.report_gen = get_report_generator()
         
     def run(self):
         """Main application logic"""
@@ -59,7 +275,8 @@ class ADAComplianceApp:
             st.title("🚶 ADA Compliance Assessment System")
             st.markdown("*AI-Powered Pedestrian Infrastructure Analysis*")
         with col2:
-            st.image("assets/logo.png", width=100) if Path("assets/logo.png").exists() else None
+            if has_logo():
+                st.image(str(LOGO_PATH), width=100)
         
         st.divider()
         
@@ -121,8 +338,10 @@ class ADAComplianceApp:
             )
             
             if uploaded_file:
-                image = Image.open(uploaded_file)
-                st.image(image, caption="Uploaded Image", use_column_width=True)
+                # Streamlit displays the encoded bytes as-is; only the
+                # analyzer path decodes them
+                image_bytes = uploaded_file.getvalue()
+                st.image(image_bytes, caption="Uploaded Image", use_column_width=True)
                 
                 location = st.text_input(
                     "Location (Optional)",
@@ -130,7 +349,7 @@ class ADAComplianceApp:
                 )
                 
                 if st.button("🔍 Analyze for ADA Compliance", type="primary", use_container_width=True):
-                    self.analyze_image(image, location, confidence, show_annotations, generate_report)
+                    self.analyze_image(image_bytes, location, confidence, show_annotations, generate_report)
         
         with col2:
             st.info("**Supported Infrastructure:**")
@@ -152,24 +371,45 @@ class ADAComplianceApp:
             - Compliance scoring
             """)
     
-    def analyze_image(self, image, location, confidence, show_annotations, generate_report):
+    def analyze_image(self, image_bytes, location, confidence, show_annotations, generate_report):
         """Analyze uploaded image"""
         
         with st.spinner("🔍 Analyzing infrastructure..."):
-            # Convert PIL to numpy
-            img_array = np.array(image)
+            # Run analysis (cached), then add the per-run fields
+            payload = cached_analyze(image_bytes, confidence)
+            if payload is None:
+                st.error("Could not decode the uploaded image")
+                return
             
-            # Run analysis
-            results = self.analyzer.analyze(
-                img_array,
-                confidence_threshold=confidence,
-                location=location
-            )
+            results = {
+                **payload,
+                'location': location,
+                'timestamp': datetime.now().isoformat(),
+                'annotated_image': None
+            }
+            if show_annotations:
+                results['annotated_image'] = self.analyzer.annotate(
+                    decode_upload(image_bytes), results
+                )
             
-            # Store in session state
-            st.session_state.latest_results = results
+            # Store in session state. Session state holds references, so
+            # leave out the full-resolution annotated image: it is only
+            # shown below and would otherwise stay alive for the session
+            st.session_state.latest_results = {
+                key: value for key, value in results.items() if key != 'annotated_image'
+            }
+            st.session_state.latest_table = ViolationTable.from_violations(results['violations'])
             st.session_state.total_analyzed += 1
             
+            # Running aggregates for the analytics tab
+            if 'totals' not in st.session_state:
+                st.session_state.totals = {
+                    'type_counts': {},
+                    'severity_counts': np.zeros(len(SEVERITIES), dtype=np.int64),
+                    'severity_costs': np.zeros(len(SEVERITIES), dtype=np.int64)
+                }
+            accumulate_totals(st.session_state.totals, st.session_state.latest_table)
+            
             # Display results
             st.success("✅ Analysis Complete!")
             
@@ -177,7 +417,7 @@ class ADAComplianceApp:
             if show_annotations and results.get('annotated_image') is not None:
                 st.subheader("Detected Violations")
                 st.image(
-                    results['annotated_image'],
+                    _to_display_jpeg(results['annotated_image']),
                     caption="Infrastructure with ADA Violations Highlighted",
                     use_column_width=True
                 )
@@ -225,6 +465,10 @@ class ADAComplianceApp:
                             use_container_width=True
                         )
     
+    # Filter, sort and export widgets rerun only this tab. The other tabs
+    # stay full-rerun: the upload tab updates state the others display, and
+    # the heatmap/analytics tabs have no widgets of their own.
+    @st.fragment
     def results_tab(self):
         """Tab for displaying detailed results"""
         
@@ -255,47 +499,37 @@ class ADAComplianceApp:
         with col3:
             min_cost = st.number_input("Min Cost ($)", min_value=0, value=0)
         
-        # Filter violations
-        violations = results['violations']
-        filtered = [
-            v for v in violations 
-            if v['severity'] in severity_filter and v['cost'] >= min_cost
-        ]
-        
-        # Sort
-        if sort_by == "Priority":
-            filtered.sort(key=lambda x: x['priority'])
-        elif sort_by == "Cost":
-            filtered.sort(key=lambda x: x['cost'], reverse=True)
-        else:
-            filtered.sort(key=lambda x: x['type'])
+        # Filter and sort violations
+        table = st.session_state.latest_table
+        order = filter_violations(table, severity_filter, min_cost, sort_by).tolist()
         
         st.divider()
         
-        # Display violations
-        for idx, violation in enumerate(filtered, 1):
+        severity_color = {
+            "High": "🔴",
+            "Medium": "🟡",
+            "Low": "🟢"
+        }
+        
+        # Display violations from the typed records built at analysis time
+        records = table.records
+        for idx, violation in enumerate((records[i] for i in order), 1):
             with st.expander(
-                f"**{idx}. {violation['type']}** - {violation['severity']} Priority",
+                f"**{idx}. {violation.type}** - {violation.severity} Priority",
                 expanded=(idx <= 3)
             ):
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    st.markdown(f"**Location:** {violation['location']}")
-                    st.markdown(f"**Detected:** {violation['detected_value']}")
-                    st.markdown(f"**ADA Standard:** {violation['standard_value']}")
-                    st.markdown(f"**Recommendation:** {violation.get('recommendation', 'Immediate remediation required')}")
+                    st.markdown(f"**Location:** {violation.location}")
+                    st.markdown(f"**Detected:** {violation.detected_value}")
+                    st.markdown(f"**ADA Standard:** {violation.standard_value}")
+                    st.markdown(f"**Recommendation:** {violation.recommendation or 'Immediate remediation required'}")
                 
                 with col2:
-                    st.metric("Remediation Cost", f"${violation['cost']:,}")
-                    st.metric("Priority Level", violation['priority'])
-                    
-                    severity_color = {
-                        "High": "🔴",
-                        "Medium": "🟡",
-                        "Low": "🟢"
-                    }
-                    st.markdown(f"{severity_color[violation['severity']]} **{violation['severity']} Severity**")
+                    st.metric("Remediation Cost", f"${violation.cost:,}")
+                    st.metric("Priority Level", violation.priority)
+                    st.markdown(f"{severity_color[violation.severity]} **{violation.severity} Severity**")
         
         st.divider()
         
@@ -304,11 +538,9 @@ class ADAComplianceApp:
         
         with col1:
             if st.button("📊 Export to CSV", use_container_width=True):
-                df = pd.DataFrame(filtered)
-                csv = df.to_csv(index=False)
                 st.download_button(
                     "Download CSV",
-                    csv,
+                    violations_to_csv([results['violations'][i] for i in order]),
                     "violations.csv",
                     "text/csv",
                     use_container_width=True
@@ -347,39 +579,23 @@ class ADAComplianceApp:
             st.markdown("*Integrate with Folium/Plotly for live geospatial data*")
             
             # Sample data
-            fig = go.Figure(data=go.Scattermapbox(
-                lat=[37.7749, 37.7849, 37.7649],
-                lon=[-122.4194, -122.4094, -122.4294],
-                mode='markers',
-                marker=dict(
-                    size=20,
-                    color=['red', 'yellow', 'green'],
-                    opacity=0.7
-                ),
-                text=['High Risk', 'Medium Risk', 'Low Risk']
-            ))
-            
-            fig.update_layout(
-                mapbox_style="open-street-map",
-                mapbox_center_lat=37.7749,
-                mapbox_center_lon=-122.4194,
-                mapbox_zoom=12,
-                height=500
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_risk_map(), use_container_width=True)
     
     def analytics_tab(self):
         """Tab for system analytics and statistics"""
         
         st.header("System Analytics & Insights")
         
-        # Sample analytics data
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Violation Type Distribution")
-            
+        # Totals over this session's analyses, or sample data before the first
+        totals = st.session_state.get('totals')
+        if totals and totals['type_counts']:
+            violation_types = totals['type_counts']
+            severity_costs = (
+                SEVERITIES,
+                tuple(totals['severity_costs'].tolist()),
+                tuple(totals['severity_counts'].tolist())
+            )
+        else:
             violation_types = {
                 "Curb Ramp Slope": 45,
                 "Sidewalk Width": 32,
@@ -388,35 +604,24 @@ class ADAComplianceApp:
                 "Detectable Warning": 18,
                 "Others": 15
             }
-            
-            fig = px.pie(
-                values=list(violation_types.values()),
-                names=list(violation_types.keys()),
-                title="Most Common Violations"
+            severity_costs = (
+                ('High', 'Medium', 'Low'),
+                (45000, 28000, 12000),
+                (23, 35, 18)
             )
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Violation Type Distribution")
+            
+            fig = build_type_pie(tuple(violation_types), tuple(violation_types.values()))
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.subheader("Cost by Severity")
             
-            severity_costs = pd.DataFrame({
-                'Severity': ['High', 'Medium', 'Low'],
-                'Total Cost': [45000, 28000, 12000],
-                'Count': [23, 35, 18]
-            })
-            
-            fig = px.bar(
-                severity_costs,
-                x='Severity',
-                y='Total Cost',
-                color='Severity',
-                color_discrete_map={
-                    'High': 'red',
-                    'Medium': 'orange',
-                    'Low': 'green'
-                },
-                title="Remediation Cost by Severity"
-            )
+            fig = build_severity_bar(*severity_costs)
             st.plotly_chart(fig, use_container_width=True)
         
         st.divider()
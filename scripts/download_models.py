@@ -2,35 +2,191 @@
 Download pre-trained models for ADA compliance assessment
 """
 
+import argparse
+import hashlib
+import os
+import sys
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Read/write granularity for downloads; large chunks keep the per-chunk
+# Python and syscall overhead negligible for multi-hundred-MB weights
+CHUNK_SIZE = 1 << 20
 
-def download_file(url: str, destination: Path):
-    """Download file with progress bar"""
-    response = requests.get(url, stream=True)
-    total_size = int(response.headers.get('content-length', 0))
-    
-    with open(destination, 'wb') as f, tqdm(
+# Parallel ranged downloads: number of streams and bytes per range request
+NUM_STREAMS = 8
+RANGE_SIZE = 16 << 20
+
+
+def _progress(destination: Path, total_size: int) -> tqdm:
+    """Progress bar for one download"""
+    return tqdm(
         desc=destination.name,
         total=total_size,
         unit='B',
         unit_scale=True,
         unit_divisor=1024,
-    ) as pbar:
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                f.write(chunk)
-                pbar.update(len(chunk))
+    )
+
+
+def _download_range(session: requests.Session, url: str, fd: int, start: int, end: int, pbar: tqdm):
+    """Fetch bytes [start, end] of url and write them at the same file offset"""
+    response = session.get(url, headers={'Range': f'bytes={start}-{end}'}, stream=True)
+    response.raise_for_status()
+    if response.status_code != 206:
+        raise RuntimeError(f"Server ignored range request (HTTP {response.status_code})")
+    
+    offset = start
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if chunk:
+            offset += os.pwrite(fd, chunk, offset)
+            pbar.update(len(chunk))
+    
+    if offset != end + 1:
+        raise RuntimeError(f"Short read for bytes {start}-{end}")
+
+
+def _download_parallel(session: requests.Session, url: str, destination: Path, total_size: int):
+    """Download url over NUM_STREAMS concurrent range requests"""
+    ranges = [
+        (start, min(start + RANGE_SIZE, total_size) - 1)
+        for start in range(0, total_size, RANGE_SIZE)
+    ]
+    
+    fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, total_size)
+        with _progress(destination, total_size) as pbar, \
+                ThreadPoolExecutor(max_workers=NUM_STREAMS) as pool:
+            futures = [
+                pool.submit(_download_range, session, url, fd, start, end, pbar)
+                for start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        os.close(fd)
+
+
+def sha256_file(path: Path) -> str:
+    """Hex SHA-256 of a file (OpenSSL-backed, so SHA-NI accelerated where available)"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        
+        digest = hashlib.sha256()
+        buffer = bytearray(CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+        return digest.hexdigest()
+
+
+def verify_checksum(path: Path, expected_sha256: str):
+    """Raise ValueError (and remove the file) if its SHA-256 does not match"""
+    actual = sha256_file(path)
+    if actual != expected_sha256.lower():
+        path.unlink()
+        raise ValueError(
+            f"Checksum mismatch for {path.name}: expected {expected_sha256}, got {actual}"
+        )
+    logger.info(f"Verified checksum of {path.name}")
+
+
+def download_file(url: str, destination: Path, sha256: str = None):
+    """
+    Download file with progress bar
+    
+    Args:
+        url: Source URL
+        destination: Output path
+        sha256: Expected hex SHA-256 of the file (optional); checked after
+            the download completes
+    """
+    _download(url, destination)
+    if sha256:
+        verify_checksum(destination, sha256)
+
+
+def _download(url: str, destination: Path):
+    """Download url to destination, in parallel ranges when supported"""
+    with requests.Session() as session:
+        # Keep one pooled connection per stream
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=NUM_STREAMS)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
+        # Split into ranges when the server advertises support for them
+        head = session.head(url, allow_redirects=True)
+        total_size = int(head.headers.get('content-length', 0))
+        if (
+            hasattr(os, 'pwrite')
+            and head.headers.get('accept-ranges', '').lower() == 'bytes'
+            and total_size > RANGE_SIZE
+        ):
+            try:
+                _download_parallel(session, head.url, destination, total_size)
+                return
+            except (requests.RequestException, RuntimeError) as e:
+                logger.warning(f"Parallel download failed, retrying sequentially: {e}")
+        
+        response = session.get(url, stream=True)
+        total_size = int(response.headers.get('content-length', 0))
+        
+        with open(destination, 'wb') as f, _progress(destination, total_size) as pbar:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    pbar.update(len(chunk))
+
+
+def export_model(model_path: Path, export_format: str, int8: bool = False):
+    """
+    Build the accelerated export the analyzer loads for export_format
+    
+    The analyzer caches exports next to the weights under a fixed name,
+    with a dynamic batch axis up to ComplianceAnalyzer.EXPORT_BATCH so the
+    same artifact serves analyze_batch; building it here moves the one-time TensorRT/ONNX compile from the
+    first server start to install time.
+    
+    Args:
+        model_path: Path of the .pt weights
+        export_format: 'engine', 'onnx', 'torchscript' or 'openvino'
+        int8: Build the INT8 variant instead of FP16/FP32
+    """
+    # Run from the repository root: python scripts/download_models.py
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from ada_compliance.analyzer import ComplianceAnalyzer
+    
+    logger.info(
+        f"Building {export_format} export of {model_path} "
+        f"(batch up to {ComplianceAnalyzer.EXPORT_BATCH})..."
+    )
+    ComplianceAnalyzer(model_path=str(model_path), export_format=export_format, int8=int8)
+    logger.info(f"Export ready; run the analyzer with export_format='{export_format}' to use it")
 
 
 def main():
     """Download all required models"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--export',
+        choices=['engine', 'onnx', 'torchscript', 'openvino'],
+        help="Also build an accelerated export of the model (e.g. 'engine' for TensorRT FP16)"
+    )
+    parser.add_argument('--int8', action='store_true', help="Quantize the export to INT8")
+    args = parser.parse_args()
+    
     models_dir = Path("models")
     models_dir.mkdir(exist_ok=True)
     
@@ -53,6 +209,9 @@ def main():
     else:
         logger.info(f"Model already exists: {model_path}")
     
+    if args.export and model_path.exists():
+        export_model(model_path, args.export, int8=args.int8)
+    
     logger.info("Model setup complete!")
 
 